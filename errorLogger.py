@@ -3,30 +3,418 @@ Error Logger Module for Supabase
 
 This module handles logging errors to Supabase execution_errors table.
 All workflow errors are captured and stored for monitoring and debugging.
+Rows are written by a dedicated logger process so Supabase latency or
+failures never reach the workflow process.
+
+Repeated errors (same error_name and last_node_executed) arriving in the
+same batch are stored as one row; full_error_data then carries "count",
+"first_ts" and "last_ts". This needs no schema change, since
+full_error_data is a JSON column.
 """
 
 import os
+import atexit
+import json
 import logging
-import uuid
-from datetime import datetime
-from typing import Optional, Dict, Any
-from supabase import create_client, Client
+import multiprocessing as mp
+import queue
+import threading
+import time
+from dataclasses import dataclass, asdict
+from datetime import datetime, timezone
+from typing import Optional, Dict, Any, List, Tuple
+import httpx
+from supabase import create_client
 from dotenv import load_dotenv
 
-# Load environment variables
-load_dotenv()
+# Prefer orjson for encoding batches (optional, falls back to stdlib json)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# HTTP/2 needs the optional h2 package (pulled in by supabase); fall back to HTTP/1.1
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# Load environment variables, skipping the .env parse when they are already exported
+# (e.g. in spawned logger processes, which inherit the parent's environment)
+if "SUPABASE_URL" not in os.environ or "SUPABASE_KEY" not in os.environ:
+    load_dotenv()
+
+# Read once at import, for every ErrorLogger built in this process
+_SUPABASE_URL = os.getenv("SUPABASE_URL")
+_SUPABASE_KEY = os.getenv("SUPABASE_KEY")
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+@dataclass
+class ErrorRecord:
+    """One row of the execution_errors table."""
+    
+    # Declared by hand instead of dataclass(slots=True) to stay compatible with Python < 3.10
+    __slots__ = (
+        "error_id", "workflow_name", "workflow_id", "execution_id", "execution_url",
+        "error_name", "error_message", "last_node_executed", "severity", "category",
+        "full_error_data", "error_message_alt"
+    )
+    
+    error_id: str
+    workflow_name: str
+    workflow_id: Optional[str]
+    execution_id: str
+    execution_url: Optional[str]
+    error_name: str
+    error_message: str
+    last_node_executed: str
+    severity: str
+    category: str
+    full_error_data: Dict[str, Any]
+    error_message_alt: Optional[str]
+
+
+# Sentinel telling the logger process to write what it has and exit (must survive pickling)
+_STOP = None
+
+# Batching: flush when _BATCH_MAX rows are queued or every _FLUSH_INTERVAL seconds
+_BATCH_MAX = 500
+_FLUSH_INTERVAL = 1.0
+
+# Attempts per batch insert; the encoded body is reused across attempts
+_INSERT_ATTEMPTS = 3
+
+# PostgREST insert headers: we never read the inserted rows back
+_INSERT_HEADERS = {"Content-Type": "application/json", "Prefer": "return=minimal"}
+
+# Layout of the human-readable message stored in error_message_alt
+_ERROR_MESSAGE_ALT_TEMPLATE = (
+    "🚨 Workflow Execution Failed\n"
+    "\n"
+    "Workflow: {workflow_name} (ID: {workflow_id})\n"
+    "Last Node: {last_node}{http_line}\n"
+    "\n"
+    "Error: {error_name}\n"
+    "Detail: {error_message}\n"
+    "\n"
+    "Time: {timestamp}\n"
+    "\n"
+    "Next Step: Review the error details and retry the workflow."
+)
+
+# Running logger processes, keyed by (supabase_url, supabase_key, table_name)
+_logger_processes: Dict[Tuple[str, str, str], Tuple[Any, Any]] = {}
+# Guards the check-then-start in _start_logger_process; ErrorLoggers are built from worker threads
+_logger_processes_lock = threading.Lock()
+
+
+def _new_id() -> str:
+    """
+    Generate a random UUID4 string without constructing a uuid.UUID object.
+    
+    Returns:
+        Hyphenated UUID4 string
+    """
+    b = bytearray(os.urandom(16))
+    b[6] = (b[6] & 0x0F) | 0x40  # version 4
+    b[8] = (b[8] & 0x3F) | 0x80  # RFC 4122 variant
+    h = b.hex()
+    return f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"
+
+
+def _utc_timestamp(epoch_seconds: float) -> str:
+    """
+    Format a Unix timestamp as ISO 8601 UTC with a trailing 'Z'.
+    
+    Args:
+        epoch_seconds: Seconds since the epoch (time.time())
+    
+    Returns:
+        Timestamp string, e.g. 2024-01-01T12:00:00.000000Z
+    """
+    return datetime.fromtimestamp(epoch_seconds, timezone.utc).replace(tzinfo=None).isoformat() + 'Z'
+
+
+def _format_error_message_alt(workflow_name: str,
+                              workflow_id: str,
+                              last_node: str,
+                              error_name: str,
+                              error_message: str,
+                              http_code: Optional[int],
+                              timestamp: str) -> str:
+    """
+    Build the human-readable error message stored in error_message_alt.
+    
+    Args:
+        workflow_name: Name of the workflow
+        workflow_id: ID of the workflow
+        last_node: Last node that was executed
+        error_name: Name/type of the error
+        error_message: Detailed error message
+        http_code: HTTP status code if applicable
+        timestamp: Time the error was logged
+    
+    Returns:
+        Formatted human-readable error message
+    """
+    return _ERROR_MESSAGE_ALT_TEMPLATE.format_map({
+        "workflow_name": workflow_name,
+        "workflow_id": workflow_id or 'N/A',
+        "last_node": last_node,
+        "http_line": f"\nHTTP Code: {http_code}" if http_code else "",
+        "error_name": error_name,
+        "error_message": error_message,
+        "timestamp": timestamp
+    })
+
+
+def _build_rows(items: List[Tuple[ErrorRecord, Optional[int], float]]) -> List[ErrorRecord]:
+    """
+    Turn queued items into table rows, coalescing repeats and adding error_message_alt.
+    
+    Identical errors within one batch (same error_name, last_node_executed,
+    error_message, workflow_id and execution_id) are collapsed into the first
+    occurrence; its full_error_data gets "count", "first_ts" and "last_ts". The
+    message is built here, in the logger process, so the workflow process only
+    pays for queueing the raw fields.
+    
+    Args:
+        items: Queued (record, http_code, logged_at) tuples
+    
+    Returns:
+        Rows ready to insert
+    """
+    groups: Dict[Tuple[Optional[str], ...], List[Tuple[ErrorRecord, Optional[int], float]]] = {}
+    for item in items:
+        record = item[0]
+        key = (record.error_name, record.last_node_executed, record.error_message,
+               record.workflow_id, record.execution_id)
+        groups.setdefault(key, []).append(item)
+    
+    rows = []
+    for group in groups.values():
+        record, http_code, logged_at = group[0]
+        if len(group) > 1:
+            record.full_error_data = {
+                **record.full_error_data,
+                "count": len(group),
+                "first_ts": _utc_timestamp(logged_at),
+                "last_ts": _utc_timestamp(group[-1][2])
+            }
+        record.error_message_alt = _format_error_message_alt(
+            workflow_name=record.workflow_name,
+            workflow_id=record.workflow_id,
+            last_node=record.last_node_executed,
+            error_name=record.error_name,
+            error_message=record.error_message,
+            http_code=http_code,
+            timestamp=_utc_timestamp(logged_at)
+        )
+        rows.append(record)
+    return rows
+
+
+def _drain(q, first: Any, max_rows: int = _BATCH_MAX,
+           timeout: float = _FLUSH_INTERVAL) -> Tuple[List[Any], bool]:
+    """
+    Collect queued items into a batch, starting from an already dequeued item.
+    
+    Waits at most `timeout` seconds for the batch to fill up to `max_rows` items.
+    
+    Args:
+        q: Queue to read from
+        first: Item already taken from the queue
+        max_rows: Maximum number of items in a batch
+        timeout: Maximum seconds to wait for the batch to fill
+    
+    Returns:
+        Tuple of (items, whether the shutdown sentinel was received)
+    """
+    rows = [first]
+    deadline = time.monotonic() + timeout
+    while len(rows) < max_rows:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        try:
+            item = q.get(timeout=remaining)
+        except queue.Empty:
+            break
+        if item is _STOP:
+            return rows, True
+        rows.append(item)
+    return rows, False
+
+
+def _encode_rows(rows: List[ErrorRecord]) -> bytes:
+    """
+    Encode a batch of rows as a JSON array.
+    
+    Args:
+        rows: Error records to encode
+    
+    Returns:
+        JSON bytes; values that aren't JSON-serializable are stringified
+    """
+    if ORJSON_AVAILABLE:
+        # orjson serializes dataclasses natively
+        return orjson.dumps(rows, default=str)
+    return json.dumps([asdict(row) for row in rows], default=str, ensure_ascii=False).encode("utf-8")
+
+
+def _create_session(supabase_url: str, supabase_key: str) -> httpx.Client:
+    """
+    Create the long-lived HTTP session the logger process uses for all inserts.
+    
+    Takes the base URL and auth headers from the PostgREST client that
+    supabase-py builds, but uses one pooled keep-alive (HTTP/2 when available)
+    client instead of its default session.
+    
+    Args:
+        supabase_url: Supabase project URL
+        supabase_key: Supabase API key
+    
+    Returns:
+        httpx.Client pointed at the project's REST endpoint
+    """
+    default_session = create_client(supabase_url, supabase_key).postgrest.session
+    session = httpx.Client(
+        base_url=default_session.base_url,
+        headers=default_session.headers,
+        http2=HTTP2_AVAILABLE,
+        timeout=5.0,
+        limits=httpx.Limits(max_connections=20, max_keepalive_connections=10)
+    )
+    default_session.close()
+    return session
+
+
+def _insert_rows(session, table_name: str, rows: List[ErrorRecord]):
+    """
+    Insert a batch of rows with one PostgREST POST, retrying transient failures.
+    
+    The batch is encoded once and the same body is sent on every attempt.
+    
+    Args:
+        session: The PostgREST httpx session (already carries auth headers and base URL)
+        table_name: Table to insert rows into
+        rows: Error rows to insert
+    """
+    body = _encode_rows(rows)
+    for attempt in range(1, _INSERT_ATTEMPTS + 1):
+        try:
+            response = session.post(table_name, content=body, headers=_INSERT_HEADERS)
+        except Exception as e:
+            error = str(e)
+        else:
+            if response.is_success:
+                logger.info("✓ Logged %d error(s) to Supabase", len(rows))
+                return
+            error = f"HTTP {response.status_code}: {response.text}"
+            if response.status_code < 500:
+                # The batch itself was rejected, retrying won't help
+                break
+        if attempt < _INSERT_ATTEMPTS:
+            time.sleep(0.5 * attempt)
+    logger.error("❌ Failed to log %d error(s) to Supabase: %s", len(rows), error)
+
+
+def _logger_process_main(q, supabase_url: str, supabase_key: str, table_name: str):
+    """
+    Entry point of the logger process: insert queued rows into Supabase in batches.
+    
+    Args:
+        q: Queue fed by ErrorLogger instances in the workflow process
+        supabase_url: Supabase project URL
+        supabase_key: Supabase API key
+        table_name: Table to insert rows into
+    """
+    session = None
+    try:
+        while True:
+            first = q.get()
+            if first is _STOP:
+                return
+            items, stop = _drain(q, first)
+            # (Re)connect per batch until it succeeds, so one failed connect doesn't drop every later batch
+            if session is None:
+                try:
+                    session = _create_session(supabase_url, supabase_key)
+                except Exception as e:
+                    logger.error("❌ Error logger process could not connect to Supabase: %s", e)
+            if session is not None:
+                _insert_rows(session, table_name, _build_rows(items))
+            if stop:
+                return
+    finally:
+        if session is not None:
+            session.close()
+
+
+def _stop_logger_process(q, proc, timeout: float = 10.0):
+    """
+    Flush pending rows and stop a logger process. Registered with atexit.
+    
+    Args:
+        q: Queue feeding the process
+        proc: The logger process
+        timeout: Maximum seconds to wait for pending rows to be written
+    """
+    if proc.is_alive():
+        q.put(_STOP)
+        proc.join(timeout)
+
+
+def _start_logger_process(supabase_url: str, supabase_key: str,
+                          table_name: str) -> Tuple[Any, Any]:
+    """
+    Return the logger process for these credentials, starting it if needed.
+    
+    The process is shared by all ErrorLogger instances in this interpreter and
+    is restarted if it has died.
+    
+    Args:
+        supabase_url: Supabase project URL
+        supabase_key: Supabase API key
+        table_name: Table to insert rows into
+    
+    Returns:
+        Tuple of (queue, process)
+    """
+    key = (supabase_url, supabase_key, table_name)
+    with _logger_processes_lock:
+        running = _logger_processes.get(key)
+        if running and running[1].is_alive():
+            return running
+    
+        # spawn (not fork): the workflow process runs threads and an event loop
+        ctx = mp.get_context("spawn")
+        q = ctx.Queue(maxsize=10000)
+        proc = ctx.Process(
+            target=_logger_process_main,
+            args=(q, supabase_url, supabase_key, table_name),
+            name="error-logger",
+            daemon=True
+        )
+        proc.start()
+        atexit.register(_stop_logger_process, q, proc)
+        _logger_processes[key] = (q, proc)
+        return q, proc
+
 
 class ErrorLogger:
     """
     Handles logging errors to Supabase execution_errors table.
     
     This class captures workflow errors and stores them in Supabase
-    for monitoring, debugging, and error tracking.
+    for monitoring, debugging, and error tracking. Errors are handed to a
+    separate logger process which writes them in multi-row batches, so logging
+    never waits on the network.
     """
     
     def __init__(self, supabase_url: str = None, supabase_key: str = None):
@@ -34,25 +422,28 @@ class ErrorLogger:
         Initialize the Error Logger.
         
         Args:
-            supabase_url (str): Supabase project URL. If None, reads from SUPABASE_URL env var.
-            supabase_key (str): Supabase API key. If None, reads from SUPABASE_KEY env var.
+            supabase_url (str): Supabase project URL. If None, uses SUPABASE_URL (read at import).
+            supabase_key (str): Supabase API key. If None, uses SUPABASE_KEY (read at import).
         """
         # Get credentials from parameters or environment variables
-        self.supabase_url = supabase_url or os.getenv("SUPABASE_URL")
-        self.supabase_key = supabase_key or os.getenv("SUPABASE_KEY")
+        self.supabase_url = supabase_url or _SUPABASE_URL
+        self.supabase_key = supabase_key or _SUPABASE_KEY
         self.table_name = "execution_errors"
         
-        # Initialize Supabase client if credentials are available
-        self.client: Optional[Client] = None
+        # Start (or reuse) the logger process if credentials are available
+        self._q = None
+        self._proc = None
         self.enabled = False
         
         if self.supabase_url and self.supabase_key:
             try:
-                self.client = create_client(self.supabase_url, self.supabase_key)
+                self._q, self._proc = _start_logger_process(
+                    self.supabase_url, self.supabase_key, self.table_name
+                )
                 self.enabled = True
                 logger.info("✓ Error logger initialized successfully")
             except Exception as e:
-                logger.warning(f"⚠ Error logger initialization failed: {e}")
+                logger.warning("⚠ Error logger initialization failed: %s", e)
                 self.enabled = False
         else:
             logger.warning("⚠ Error logger disabled: Supabase credentials not found")
@@ -78,26 +469,15 @@ class ErrorLogger:
         Returns:
             Formatted human-readable error message
         """
-        timestamp = datetime.utcnow().isoformat() + 'Z'
-        
-        message = f"""🚨 Workflow Execution Failed
-
-Workflow: {workflow_name} (ID: {workflow_id or 'N/A'})
-Last Node: {last_node}"""
-        
-        if http_code:
-            message += f"\nHTTP Code: {http_code}"
-        
-        message += f"""
-
-Error: {error_name}
-Detail: {error_message}
-
-Time: {timestamp}
-
-Next Step: Review the error details and retry the workflow."""
-        
-        return message
+        return _format_error_message_alt(
+            workflow_name=workflow_name,
+            workflow_id=workflow_id,
+            last_node=last_node,
+            error_name=error_name,
+            error_message=error_message,
+            http_code=http_code,
+            timestamp=_utc_timestamp(time.time())
+        )
     
     def log_error(self,
                   workflow_name: str = "pdf-generation-workflow",
@@ -112,7 +492,9 @@ Next Step: Review the error details and retry the workflow."""
                   full_error_data: Optional[Dict[str, Any]] = None,
                   http_code: Optional[int] = None) -> bool:
         """
-        Log an error to Supabase execution_errors table.
+        Queue an error for the Supabase execution_errors table.
+        
+        The row is written asynchronously by the logger process.
         
         Args:
             workflow_name: Name of the workflow (default: pdf-generation-workflow)
@@ -128,7 +510,7 @@ Next Step: Review the error details and retry the workflow."""
             http_code: HTTP status code if applicable (optional)
         
         Returns:
-            bool: True if error was logged successfully, False otherwise
+            bool: True if error was queued successfully, False otherwise
         """
         if not self.enabled:
             logger.warning("⚠ Error logging skipped: Logger not enabled")
@@ -136,46 +518,44 @@ Next Step: Review the error details and retry the workflow."""
         
         try:
             # Generate unique error ID
-            error_id = str(uuid.uuid4())
+            error_id = _new_id()
             
             # Generate execution ID if not provided
             if not execution_id:
-                execution_id = str(uuid.uuid4())
+                execution_id = _new_id()
             
-            # Generate human-readable error message
-            error_message_alt = self.generate_error_message_alt(
+            # Prepare error data
+            record = ErrorRecord(
+                error_id=error_id,
                 workflow_name=workflow_name,
-                workflow_id=workflow_id or "N/A",
-                last_node=last_node_executed,
+                workflow_id=workflow_id,
+                execution_id=execution_id,
+                execution_url=execution_url,
                 error_name=error_name,
                 error_message=error_message,
-                http_code=http_code
+                last_node_executed=last_node_executed,
+                severity=severity,
+                category=category,
+                full_error_data=full_error_data or {},
+                error_message_alt=None
             )
             
-            # Prepare error data
-            error_data = {
-                "error_id": error_id,
-                "workflow_name": workflow_name,
-                "workflow_id": workflow_id,
-                "execution_id": execution_id,
-                "execution_url": execution_url,
-                "error_name": error_name,
-                "error_message": error_message,
-                "last_node_executed": last_node_executed,
-                "severity": severity,
-                "category": category,
-                "full_error_data": full_error_data or {},
-                "error_message_alt": error_message_alt
-            }
-            
-            # Insert into Supabase
-            response = self.client.table(self.table_name).insert(error_data).execute()
+            # Restart the logger process if it has died; rows queued to a dead process are lost
+            if not self._proc.is_alive():
+                logger.warning("⚠ Error logger process is not running, restarting it")
+                self._q, self._proc = _start_logger_process(
+                    self.supabase_url, self.supabase_key, self.table_name
+                )
             
-            logger.info(f"✓ Error logged to Supabase (ID: {error_id})")
+            # Hand off to the logger process, which adds error_message_alt
+            self._q.put_nowait((record, http_code, time.time()))
             return True
             
+        except queue.Full:
+            logger.error("❌ Failed to log error to Supabase: queue is full")
+            return False
         except Exception as e:
-            logger.error(f"❌ Failed to log error to Supabase: {e}")
+            logger.error("❌ Failed to log error to Supabase: %s", e)
             return False
     
     def log_workflow_error(self,
@@ -193,6 +573,11 @@ Next Step: Review the error details and retry the workflow."""
         Returns:
             bool: True if error was logged successfully
         """
+        # Bail out before stringifying the exception or building context
+        if not self.enabled:
+            logger.warning("⚠ Error logging skipped: Logger not enabled")
+            return False
+        
         error_name = type(error).__name__
         error_message = str(error)
         
@@ -207,11 +592,13 @@ Next Step: Review the error details and retry the workflow."""
             full_error_data.update(additional_context)
         
         # Determine severity based on error type
-        severity = "error"
-        if "critical" in error_message.lower() or "fatal" in error_message.lower():
+        message_lower = error_message.lower()
+        if "critical" in message_lower or "fatal" in message_lower:
             severity = "critical"
-        elif "warning" in error_message.lower():
+        elif "warning" in message_lower:
             severity = "warning"
+        else:
+            severity = "error"
         
         return self.log_error(
             error_name=error_name,
@@ -228,21 +615,19 @@ def main():
     """
     Example usage of the ErrorLogger class.
     """
-    print("=" * 60)
-    print("ERROR LOGGER - TEST MODE")
-    print("=" * 60)
+    logger.info("ERROR LOGGER - TEST MODE")
     
     try:
         # Initialize error logger
         error_logger = ErrorLogger()
         
         if not error_logger.enabled:
-            print("\n⚠ Error logger is not enabled")
-            print("Please set SUPABASE_URL and SUPABASE_KEY in .env file")
+            logger.warning("⚠ Error logger is not enabled")
+            logger.warning("Please set SUPABASE_URL and SUPABASE_KEY in .env file")
             return
         
         # Example 1: Log a test error
-        print("\n📝 Logging test error...")
+        logger.info("📝 Logging test error...")
         success = error_logger.log_error(
             workflow_name="pdf-generation-workflow",
             error_name="TestError",
@@ -254,12 +639,12 @@ def main():
         )
         
         if success:
-            print("✅ Test error logged successfully!")
+            logger.info("✅ Test error queued successfully!")
         else:
-            print("❌ Failed to log test error")
+            logger.error("❌ Failed to queue test error")
         
         # Example 2: Log a workflow error using convenience method
-        print("\n📝 Logging workflow error using convenience method...")
+        logger.info("📝 Logging workflow error using convenience method...")
         try:
             # Simulate an error
             raise ValueError("Sample validation error")
@@ -271,14 +656,12 @@ def main():
             )
             
             if success:
-                print("✅ Workflow error logged successfully!")
+                logger.info("✅ Workflow error queued successfully!")
             else:
-                print("❌ Failed to log workflow error")
+                logger.error("❌ Failed to queue workflow error")
         
     except Exception as e:
-        print(f"\n❌ Unexpected Error: {e}")
-    
-    print("\n" + "=" * 60)
+        logger.error("❌ Unexpected Error: %s", e)
 
 
 if __name__ == "__main__":
@@ -1,8 +1,81 @@
-from jinja2 import Environment, FileSystemLoader
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, Template, TemplateNotFound
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from types import MappingProxyType
 import json
 import os
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import Collection, Dict, List, Any, Mapping, Optional
+import logging
+
+# Prefer orjson for parsing data files (optional, falls back to stdlib json)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# O_BINARY only exists (and matters) on Windows
+_WRITE_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0)
+
+
+@lru_cache(maxsize=16)
+def _load_json(path: str, mtime_ns: int, size: int) -> Mapping[str, Any]:
+    """
+    Parse a JSON data file, cached by path, modification time and size.
+    
+    A rewritten file gets a new cache key, so stale data is never returned.
+    The result is read-only because it is shared between callers.
+    
+    Args:
+        path (str): Path to the JSON file.
+        mtime_ns (int): File modification time in nanoseconds.
+        size (int): File size in bytes.
+    
+    Returns:
+        Mapping: Read-only view of the parsed data.
+    """
+    with open(path, 'rb') as f:
+        raw = f.read()
+    data = orjson.loads(raw) if ORJSON_AVAILABLE else json.loads(raw.decode('utf-8'))
+    return MappingProxyType(data)
+
+
+@lru_cache(maxsize=None)
+def _get_environment(templates_folder: str, bytecode_cache_dir: Optional[str] = None) -> Environment:
+    """
+    Get the Jinja2 environment for a templates folder, shared by all generators.
+    
+    Compiled templates live in the environment's cache, so each template is parsed
+    once per process instead of once per generator (i.e. once per request).
+    Templates don't change while the process is running, so the mtime check on
+    every fetch is skipped; restart the process to pick up edited templates.
+    
+    Compiled template bytecode is also written to disk, so a freshly started process
+    loads it instead of parsing the templates again. Entries are keyed by the
+    template source checksum, so an edited template is simply recompiled.
+    
+    Args:
+        templates_folder (str): Path to the templates folder.
+        bytecode_cache_dir (str): Directory for the bytecode cache. If None, Jinja2 uses
+                                  a per-user directory in the system temp folder.
+    
+    Returns:
+        Environment: The shared environment.
+    """
+    env = Environment(
+        loader=FileSystemLoader(templates_folder),
+        autoescape=True,
+        cache_size=400,
+        auto_reload=False,
+        bytecode_cache=FileSystemBytecodeCache(bytecode_cache_dir)
+    )
+    logger.info("✓ Jinja2 environment configured with templates from: %s", templates_folder)
+    return env
 
 
 class HTMLGenerator:
@@ -13,8 +86,14 @@ class HTMLGenerator:
     provided in JSON format.
     """
     
+    # OfferLanguage (casefolded) -> templates folder
+    _LANG_MAP = {'polish': 'templates-Polish', 'english': 'templates-English'}
+    
+    DEFAULT_TEMPLATES = ['coverpage.html', 'page1.html', 'page2.html', 'page3.html', 'endingpage.html']
+    
     def __init__(self, data_file_path: str = None, templates_folder: str = None, 
-                 output_folder: str = None):
+                 output_folder: str = None, data: Optional[Mapping[str, Any]] = None,
+                 bytecode_cache_dir: str = None):
         """
         Initialize the HTMLGenerator.
         
@@ -23,6 +102,9 @@ class HTMLGenerator:
             templates_folder (str): Path to templates folder. Defaults to 'templates' in current directory.
                                    If None, will be auto-selected based on OfferLanguage in JSON data.
             output_folder (str): Path to output folder. Defaults to 'htmlGenerated' in current directory.
+            data (Mapping): Already-parsed offer data. If given, it is used instead of reading data_file_path.
+            bytecode_cache_dir (str): Directory for compiled template bytecode, reused across restarts.
+                                      If None, a per-user directory in the system temp folder is used.
         """
         self.base_dir = Path(__file__).parent
         self.data_file_path = Path(data_file_path) if data_file_path else self.base_dir / 'data.json'
@@ -30,68 +112,118 @@ class HTMLGenerator:
         self.templates_folder = None  # Will be set after loading data
         self.output_folder = Path(output_folder) if output_folder else self.base_dir / 'htmlGenerated'
         
-        self.data: Dict[str, Any] = {}
+        self._preloaded_data = data
+        self.bytecode_cache_dir = str(bytecode_cache_dir) if bytecode_cache_dir else None
+        self.data: Mapping[str, Any] = {}
         self.env = None
+        self._compiled: Dict[str, Template] = {}
+        self._env_folder: Optional[Path] = None
+        self._output_ready = False
         
-    def load_data(self) -> Dict[str, Any]:
+    def load_data(self) -> Mapping[str, Any]:
         """
         Load data from JSON file and determine the template folder based on OfferLanguage.
         
+        Parsed files are cached, so repeated loads of an unchanged file skip the parse.
+        Data passed to the constructor is used as-is and no file is read.
+        
         Returns:
-            Dict containing the loaded data.
+            Read-only mapping containing the loaded data.
             
         Raises:
             FileNotFoundError: If the data file doesn't exist.
             json.JSONDecodeError: If the JSON file is invalid.
         """
-        if not self.data_file_path.exists():
-            raise FileNotFoundError(f"Data file not found: {self.data_file_path}")
-        
-        with open(self.data_file_path, encoding='utf-8') as f:
-            self.data = json.load(f)
-        
-        print(f"✓ Loaded data from: {self.data_file_path}")
+        if self._preloaded_data is not None:
+            self.data = self._preloaded_data
+            logger.info("✓ Using in-memory data")
+        else:
+            try:
+                stat = self.data_file_path.stat()
+            except FileNotFoundError:
+                raise FileNotFoundError(f"Data file not found: {self.data_file_path}") from None
+            
+            self.data = _load_json(str(self.data_file_path), stat.st_mtime_ns, stat.st_size)
+            
+            logger.info("✓ Loaded data from: %s", self.data_file_path)
         
         # Determine template folder based on OfferLanguage
         if self.templates_folder_override:
             self.templates_folder = self.templates_folder_override
-            print(f"✓ Using manually specified templates folder: {self.templates_folder}")
+            logger.info("✓ Using manually specified templates folder: %s", self.templates_folder)
         else:
             offer_language = self.data.get('OfferLanguage', 'English').strip()
+            folder_name = self._LANG_MAP.get(offer_language.casefold())
             
-            if offer_language.lower() == 'polish':
-                self.templates_folder = self.base_dir / 'templates-Polish'
-                print(f"✓ Language detected: Polish - Using templates-Polish folder")
-            elif offer_language.lower() == 'english':
-                self.templates_folder = self.base_dir / 'templates-English'
-                print(f"✓ Language detected: English - Using templates-English folder")
+            if folder_name:
+                logger.info("✓ Language detected: %s - Using %s folder", offer_language, folder_name)
             else:
                 # Default to English if language not recognized
-                self.templates_folder = self.base_dir / 'templates-English'
-                print(f"⚠ Language '{offer_language}' not recognized. Defaulting to templates-English folder")
+                folder_name = self._LANG_MAP['english']
+                logger.warning("⚠ Language '%s' not recognized. Defaulting to %s folder", offer_language, folder_name)
+            self.templates_folder = self.base_dir / folder_name
         
         return self.data
     
-    def setup_jinja_environment(self):
+    def setup_jinja_environment(self, template_list: List[str] = None):
         """
-        Set up Jinja2 environment with the templates folder.
+        Set up Jinja2 environment with the templates folder and precompile templates.
+        
+        The environment is shared per templates folder across generators (see
+        _get_environment), so templates are only compiled the first time any
+        generator uses them.
+        
+        Args:
+            template_list (List[str]): Templates to compile up front. Defaults to DEFAULT_TEMPLATES.
+                                       Missing templates are skipped and reported when rendered.
         
         Raises:
             FileNotFoundError: If templates folder doesn't exist.
+            TemplateSyntaxError: If a template fails to compile.
         """
-        if not self.templates_folder.exists():
-            raise FileNotFoundError(f"Templates folder not found: {self.templates_folder}")
+        # Reuse the environment across runs unless the language switched the templates folder
+        if self.env is None or self._env_folder != self.templates_folder:
+            if not self.templates_folder.exists():
+                raise FileNotFoundError(f"Templates folder not found: {self.templates_folder}")
+            
+            self.env = _get_environment(str(self.templates_folder), self.bytecode_cache_dir)
+            self._env_folder = self.templates_folder
+            self._compiled = {}
         
-        self.env = Environment(
-            loader=FileSystemLoader(str(self.templates_folder)),
-            autoescape=True
-        )
-        print(f"✓ Jinja2 environment configured with templates from: {self.templates_folder}")
+        for template_name in self.DEFAULT_TEMPLATES if template_list is None else template_list:
+            if template_name in self._compiled:
+                continue
+            try:
+                self._compiled[template_name] = self.env.get_template(template_name)
+            except TemplateNotFound:
+                logger.warning("⚠ Template not found: %s", template_name)
     
     def create_output_directory(self):
-        """Create output directory if it doesn't exist."""
+        """Create output directory if it doesn't exist (once per generator)."""
+        if self._output_ready:
+            return
         self.output_folder.mkdir(parents=True, exist_ok=True)
-        print(f"✓ Output directory ready: {self.output_folder}")
+        self._output_ready = True
+        logger.info("✓ Output directory ready: %s", self.output_folder)
+    
+    def _get_template(self, template_name: str) -> Template:
+        """
+        Get a compiled template, setting up the Jinja2 environment on first use.
+        
+        Args:
+            template_name (str): Name of the template file.
+        
+        Returns:
+            Template: The compiled template.
+        """
+        if not self.data:
+            raise RuntimeError("No data loaded. Call load_data() first.")
+        
+        # Build the environment on first render so load_data()-only callers never pay for it
+        if self.env is None:
+            self.setup_jinja_environment()
+        
+        return self._compiled.get(template_name) or self.env.get_template(template_name)
     
     def render_template(self, template_name: str) -> str:
         """
@@ -106,15 +238,31 @@ class HTMLGenerator:
         Raises:
             Exception: If template rendering fails.
         """
-        if self.env is None:
-            raise RuntimeError("Jinja2 environment not initialized. Call setup_jinja_environment() first.")
+        return self._get_template(template_name).render(self.data)
+    
+    def _write_chunks(self, filename: str, chunks) -> Path:
+        """
+        Write text chunks to a file in the output folder.
         
-        if not self.data:
-            raise RuntimeError("No data loaded. Call load_data() first.")
+        Args:
+            filename (str): Name of the output file.
+            chunks: Iterable of str chunks (a rendered page or a template stream).
         
-        template = self.env.get_template(template_name)
-        output_html = template.render(**self.data)
-        return output_html
+        Returns:
+            Path: Path to the written file.
+        """
+        # Encode each chunk and write with raw os calls: open + write + close, without
+        # the fstat/isatty/lseek probes the buffered file object adds
+        output_path = self.output_folder / filename
+        fd = os.open(output_path, _WRITE_FLAGS, 0o644)
+        try:
+            for chunk in chunks:
+                data = memoryview(chunk.encode('utf-8'))
+                while data:
+                    data = data[os.write(fd, data):]
+        finally:
+            os.close(fd)
+        return output_path
     
     def save_html(self, filename: str, content: str):
         """
@@ -124,60 +272,100 @@ class HTMLGenerator:
             filename (str): Name of the output file.
             content (str): HTML content to save.
         """
-        output_path = self.output_folder / filename
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(content)
-        print(f"✓ Generated {filename}")
+        self._write_chunks(filename, (content,))
+        logger.info("✓ Generated %s", filename)
     
-    def generate_html_files(self, template_list: List[str] = None) -> List[Path]:
+    def _render_one(self, template_name: str) -> Optional[Path]:
+        """
+        Render a single template and write it to the output folder.
+        
+        Args:
+            template_name (str): Name of the template file to render.
+        
+        Returns:
+            Path: Path to the generated HTML file, or None if rendering failed.
+        """
+        try:
+            # Stream the output to disk in chunks instead of building the whole page in memory
+            stream = self._get_template(template_name).stream(self.data)
+            stream.enable_buffering(size=256)
+            output_path = self._write_chunks(template_name, stream)
+            logger.info("✓ Generated %s", template_name)
+            return output_path
+        except Exception as e:
+            logger.error("✗ Error generating %s: %s", template_name, e)
+            return None
+    
+    def _static_source(self, template_name: str) -> Optional[Path]:
+        """
+        Return the source of a template that renders to itself, instead of rendering it.
+        
+        Args:
+            template_name (str): Name of the static template.
+        
+        Returns:
+            Path: Path to the template file, or None if it does not exist.
+        """
+        source = self.templates_folder / template_name
+        if not source.is_file():
+            logger.error("✗ Static page not found: %s", source)
+            return None
+        return source
+    
+    def generate_html_files(self, template_list: List[str] = None,
+                            static_pages: Collection[str] = ()) -> List[Path]:
         """
         Generate HTML files from templates.
         
         Args:
             template_list (List[str]): List of template names to render.
                                        Defaults to common templates including endingpage.
+            static_pages (Collection[str]): Templates without data placeholders. They are not
+                                            rendered; their template file is returned in their place.
         
         Returns:
-            List[Path]: List of paths to generated HTML files.
+            List[Path]: List of paths to generated HTML files, in template_list order.
         """
         if template_list is None:
-            template_list = ['coverpage.html', 'page1.html', 'page2.html', 'page3.html', 'endingpage.html']
+            template_list = self.DEFAULT_TEMPLATES
         
-        generated_files = []
+        def page(template_name: str) -> Optional[Path]:
+            if template_name in static_pages:
+                return self._static_source(template_name)
+            return self._render_one(template_name)
         
-        for template_name in template_list:
-            try:
-                output_html = self.render_template(template_name)
-                self.save_html(template_name, output_html)
-                generated_files.append(self.output_folder / template_name)
-            except Exception as e:
-                print(f"✗ Error generating {template_name}: {e}")
+        # Templates are independent, so render and write them concurrently
+        with ThreadPoolExecutor(max_workers=max(1, min(len(template_list), os.cpu_count() or 1))) as executor:
+            results = list(executor.map(page, template_list))
+        generated_files = [path for path in results if path is not None]
         
-        print(f"\n✅ All files generated in: {self.output_folder}")
+        logger.info("✅ All files generated in: %s", self.output_folder)
         return generated_files
     
-    def run(self, template_list: List[str] = None) -> List[Path]:
+    def run(self, template_list: List[str] = None,
+            static_pages: Collection[str] = ()) -> List[Path]:
         """
         Execute the complete HTML generation workflow.
         
         Args:
             template_list (List[str]): List of template names to render.
+            static_pages (Collection[str]): Templates to pass through unrendered
+                                            (see generate_html_files).
         
         Returns:
             List[Path]: List of paths to generated HTML files.
         """
-        print("=" * 60)
-        print("HTML GENERATION WORKFLOW STARTED")
-        print("=" * 60)
+        logger.info("HTML GENERATION WORKFLOW STARTED")
+        
+        if template_list is None:
+            template_list = self.DEFAULT_TEMPLATES
         
         self.load_data()
-        self.setup_jinja_environment()
+        self.setup_jinja_environment([name for name in template_list if name not in static_pages])
         self.create_output_directory()
-        generated_files = self.generate_html_files(template_list)
+        generated_files = self.generate_html_files(template_list, static_pages)
         
-        print("=" * 60)
-        print("HTML GENERATION COMPLETED")
-        print("=" * 60)
+        logger.info("HTML GENERATION COMPLETED")
         
         return generated_files
 
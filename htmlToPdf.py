@@ -5,11 +5,183 @@ Most reliable method - works like printing from a browser
 """
 
 import asyncio
-import sys
+from contextlib import asynccontextmanager
+from functools import lru_cache
 from pathlib import Path
-import tempfile
 import json
-from typing import List, Union, Optional
+import logging
+from typing import Any, List, Mapping, Union, Optional
+
+from playwright.async_api import async_playwright
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class _FilenameSanitizer(dict):
+    """str.translate() table mapping every character that is not alphanumeric, '-' or '_' to '_'.
+
+    Entries are computed on first sight of a code point and cached, so any Unicode
+    company name is handled while repeated characters are a plain dict hit.
+    """
+
+    def __missing__(self, codepoint: int):
+        char = chr(codepoint)
+        self[codepoint] = value = codepoint if char.isalnum() or char in '-_' else '_'
+        return value
+
+
+_SANITIZE_TABLE = _FilenameSanitizer()
+
+
+def pdf_filename(client_company: str, offer_id: str, version: str) -> str:
+    """Return the PDF filename for an offer: ClientName_OfferID_Version.pdf."""
+    # Sanitize client company name (invalid characters and spaces become '_')
+    return f"{client_company.translate(_SANITIZE_TABLE)}_{offer_id}_{version}.pdf"
+
+# Pages whose template has no data placeholders, so the rendered page equals the template source
+STATIC_PAGES = frozenset({"endingpage.html"})
+
+
+@lru_cache(maxsize=8)
+def _read_static_page(path: str, mtime_ns: int, size: int) -> str:
+    """Read a static page's template source, cached by path, modification time and size."""
+    with open(path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+# Chromium flags for static HTML -> PDF rendering: no sandbox or /dev/shm (usually unavailable
+# in containers), and none of the GPU, extension or background services a print job never uses
+CHROMIUM_ARGS = [
+    "--no-sandbox",
+    "--no-zygote",
+    "--disable-dev-shm-usage",
+    "--disable-gpu",
+    "--disable-extensions",
+    "--disable-background-networking",
+    "--disable-default-apps",
+    "--disable-sync",
+    "--mute-audio",
+    "--no-first-run",
+]
+
+
+class BrowserPool:
+    """
+    Long-lived Chromium browser shared by concurrent PDF conversions.
+    
+    Conversions borrow a ready (context, page) pair and hand it back when done, so a
+    job only pays for set_content() and pdf(); a pair whose job failed is closed
+    instead of being reused. At most `max_contexts` conversions render at the same
+    time; further requests wait for a free slot instead of piling more pages onto
+    Chromium.
+    Because Playwright keeps growing memory on a browser that lives forever, the
+    browser is relaunched every `recycle_every` jobs, together with all of its pages;
+    the old instance is closed once the conversions still running on it have finished.
+    A browser that has crashed or disconnected is relaunched on the next borrow.
+    """
+    
+    def __init__(self, recycle_every: int = 50, max_contexts: int = 8):
+        """
+        Initialize the BrowserPool. Call start() before using it.
+        
+        Args:
+            recycle_every (int): Number of jobs to serve before relaunching the browser.
+            max_contexts (int): Maximum number of contexts open at the same time.
+        """
+        self.recycle_every = recycle_every
+        self.uses = 0
+        self.lock = asyncio.Lock()
+        self._slots = asyncio.Semaphore(max_contexts)
+        self.browser = None
+        self._playwright = None
+        self._active = {}  # browser -> number of borrowed pages
+        self._idle = []  # (context, page) pairs on the current browser, ready for reuse
+    
+    async def _launch(self):
+        return await self._playwright.chromium.launch(headless=True, args=CHROMIUM_ARGS)
+    
+    async def start(self):
+        """Start Playwright, launch the first browser and pre-warm one page."""
+        self._playwright = await async_playwright().start()
+        self.browser = await self._launch()
+        context = await self.browser.new_context()
+        self._idle.append((context, await context.new_page()))
+    
+    async def close(self):
+        """Close every browser this pool launched and stop Playwright."""
+        async with self.lock:
+            browsers = set(self._active) | {self.browser}
+            self._active.clear()
+            self._idle.clear()
+            self.browser = None
+        for browser in browsers:
+            if browser is not None:
+                await browser.close()
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+    
+    @asynccontextmanager
+    async def page(self):
+        """
+        Borrow a page on the current browser, recycling the browser when due.
+        Waits for a free slot when `max_contexts` pages are already borrowed.
+        
+        Yields:
+            Page: Returned to the pool when the block exits normally, closed with its
+                  context if the block raises.
+        
+        Raises:
+            RuntimeError: If the pool has not been started or has been closed.
+        """
+        async with self._slots:
+            async with self.lock:
+                if self.browser is None:
+                    raise RuntimeError("BrowserPool is closed")
+                self.uses += 1
+                # Relaunch when due, or right away if Chromium crashed or lost its connection
+                crashed = not self.browser.is_connected()
+                if crashed or self.uses % self.recycle_every == 0:
+                    if crashed:
+                        logger.warning("⚠ Chromium browser disconnected, relaunching")
+                    old_browser = self.browser
+                    self.browser = await self._launch()
+                    # Idle pages live on the old browser and go away with it
+                    self._idle.clear()
+                    if not self._active.get(old_browser):
+                        self._active.pop(old_browser, None)
+                        await old_browser.close()
+                browser = self.browser
+                self._active[browser] = self._active.get(browser, 0) + 1
+                slot = self._idle.pop() if self._idle else None
+            
+            try:
+                if slot is None:
+                    context = await browser.new_context()
+                    slot = (context, await context.new_page())
+                context, page = slot
+                reusable = False
+                try:
+                    yield page
+                    reusable = True
+                finally:
+                    if reusable and browser is self.browser:
+                        self._idle.append(slot)
+                    else:
+                        await context.close()
+            finally:
+                async with self.lock:
+                    # close() has already shut every browser down if it ran mid-job
+                    retired = False
+                    if browser in self._active:
+                        self._active[browser] -= 1
+                        retired = browser is not self.browser and not self._active[browser]
+                        if retired:
+                            del self._active[browser]
+                if retired:
+                    await browser.close()
+
 
 class PDFConverter:
     """
@@ -20,7 +192,7 @@ class PDFConverter:
     """
     
     def __init__(self, data_file_path: str = None, html_input_folder: str = None,
-                 pdf_output_folder: str = None):
+                 pdf_output_folder: str = None, browser_pool: Optional[BrowserPool] = None):
         """
         Initialize the PDFConverter.
         
@@ -30,148 +202,159 @@ class PDFConverter:
                                      Defaults to 'htmlGenerated' in current directory.
             pdf_output_folder (str): Path to output folder for PDF. 
                                     Defaults to 'finalPdf' in current directory.
+            browser_pool (BrowserPool): Started pool to render with. If None, a browser
+                                        is launched (and closed) for every conversion.
         """
         self.base_dir = Path(__file__).parent
         self.data_file_path = Path(data_file_path) if data_file_path else self.base_dir / 'data.json'
         self.html_input_folder = Path(html_input_folder) if html_input_folder else self.base_dir / 'htmlGenerated'
         self.pdf_output_folder = Path(pdf_output_folder) if pdf_output_folder else self.base_dir / 'finalPdf'
+        self.browser_pool = browser_pool
+        # Folder of the templates the HTML was rendered from; lets static pages be served from memory
+        self.templates_folder: Optional[Path] = None
         
         self.data = {}
         self.pdf_filename = "offer.pdf"
     
-    def load_data(self):
-        """Load data from JSON file to get client information and generate PDF filename."""
-        if not self.data_file_path.exists():
-            print(f"⚠ Warning: data.json not found: {self.data_file_path}")
-            return
+    def load_data(self, data: Optional[Mapping[str, Any]] = None):
+        """
+        Load data to get client information and generate PDF filename.
         
-        with open(self.data_file_path, 'r', encoding='utf-8') as f:
-            self.data = json.load(f)
+        Args:
+            data (Mapping, optional): Already-parsed offer data. If None, the JSON data file is read.
+        """
+        if data is not None:
+            self.data = data
+        elif not self.data_file_path.exists():
+            logger.warning("⚠ Warning: data.json not found: %s", self.data_file_path)
+            return
+        else:
+            with open(self.data_file_path, 'r', encoding='utf-8') as f:
+                self.data = json.load(f)
         
         # Get client company name, offer_id, and version for PDF filename
         client_company = self.data.get('client', {}).get('company', 'Client')
         offer_id = self.data.get('offer_id', 'offer')
         version = self.data.get('version', 'v1.0')
         
-        # Sanitize client company name (remove invalid characters)
-        sanitized_company = "".join(
-            c if c.isalnum() or c in (' ', '-', '_') else '_' 
-            for c in client_company
-        ).replace(' ', '_')
-        
         # Create filename: ClientName_OfferID_Version.pdf
-        self.pdf_filename = f"{sanitized_company}_{offer_id}_{version}.pdf"
+        self.pdf_filename = pdf_filename(client_company, offer_id, version)
         
-        print(f"✓ PDF will be named: {self.pdf_filename}")
+        logger.info("✓ PDF will be named: %s", self.pdf_filename)
     
     def create_output_directory(self):
         """Create PDF output directory if it doesn't exist."""
         self.pdf_output_folder.mkdir(parents=True, exist_ok=True)
-        print(f"✓ PDF output directory ready: {self.pdf_output_folder}")
+        logger.info("✓ PDF output directory ready: %s", self.pdf_output_folder)
     
-    async def convert_html_to_pdf(self, html_files: List[Union[str, Path]], 
-                                  output_pdf_path: Optional[Path] = None) -> Optional[str]:
+    async def render_pdf(self, html_files: List[Union[str, Path]]) -> bytes:
         """
-        Convert HTML files to PDF using Playwright (browser-based conversion).
+        Render HTML files into one PDF document in memory.
         
         Args:
-            html_files (List): List of paths to HTML files to convert.
-            output_pdf_path (Path, optional): Output PDF path.
+            html_files (List): List of paths to HTML files, in page order.
         
         Returns:
-            str: Path to the generated PDF file, or None if conversion failed.
+            bytes: The PDF document.
+        
+        Raises:
+            FileNotFoundError: If one of the HTML files does not exist.
         """
-        try:
-            from playwright.async_api import async_playwright
-
-            # Convert to Path objects
-            html_paths = [Path(f).resolve() for f in html_files]
-
-            for html_path in html_paths:
-                if not html_path.exists():
-                    raise FileNotFoundError(f"HTML file not found: {html_path}")
+        # Convert to Path objects
+        html_paths = [Path(f) for f in html_files]
 
-            # Output PDF path
-            if output_pdf_path is None:
-                output_pdf_path = self.pdf_output_folder / self.pdf_filename
-            else:
-                output_pdf_path = Path(output_pdf_path).resolve()
+        logger.info("Converting %s to one PDF using browser engine...", ', '.join(f.name for f in html_paths))
 
-            print(f"Converting {', '.join([f.name for f in html_paths])} to one PDF using browser engine...")
+        # Read the pages off the event loop before taking a browser page, so a missing
+        # file fails without holding a slot; pages are joined with page breaks in between
+        contents = await asyncio.gather(
+            *[asyncio.to_thread(self._read_page, html_path) for html_path in html_paths]
+        )
+        combined_html = '<div style="page-break-before: always;"></div>'.join(contents)
 
-            async with async_playwright() as p:
-                browser = await p.chromium.launch()
-                # Set base_url to the directory containing your HTML and images
-                base_dir = str(html_paths[0].parent.resolve())
-                context = await browser.new_context(base_url=f"file://{base_dir}/")
-                page = await context.new_page()
+        if self.browser_pool is not None:
+            # Shared browser: borrow a warm page
+            async with self.browser_pool.page() as page:
+                return await self._render_pdf(page, combined_html)
 
-                # Combine all HTML files into one temp file with page breaks
-                combined_html = ""
-                for idx, html_path in enumerate(html_paths):
-                    html_content = html_path.read_text(encoding="utf-8")
-                    if idx > 0:
-                        # Add page break between files
-                        combined_html += '<div style="page-break-before: always;"></div>'
-                    combined_html += html_content
-
-                with tempfile.NamedTemporaryFile(delete=False, suffix=".html", mode="w", encoding="utf-8") as tmp:
-                    tmp.write(combined_html)
-                    tmp_path = Path(tmp.name)
-
-                await page.goto(f"file://{tmp_path}")
-                await page.wait_for_load_state('networkidle')
-                # Extra explicit wait for network idle
-                await asyncio.sleep(1)  # Give browser a moment to finish rendering
-                await page.pdf(
-                    path=str(output_pdf_path),
-                    format='A4',
-                    margin={
-                        'top': '20mm',
-                        'right': '20mm',
-                        'bottom': '20mm',
-                        'left': '20mm'
-                    },
-                    print_background=True,
-                    prefer_css_page_size=True
-                )
+        async with async_playwright() as p:
+            browser = await p.chromium.launch(headless=True, args=CHROMIUM_ARGS)
+            try:
+                return await self._render_pdf(await browser.new_page(), combined_html)
+            finally:
                 await browser.close()
-                
-                # Clean up temp file
-                tmp_path.unlink(missing_ok=True)
-
-            print(f"✅ PDF generated successfully: {output_pdf_path}")
-            
-            # Display file size
-            if output_pdf_path.exists():
-                file_size = output_pdf_path.stat().st_size
-                file_size_kb = file_size / 1024
-                print(f"📦 File size: {file_size_kb:.1f} KB")
-            
-            return str(output_pdf_path)
+    
+    async def convert_html_to_pdf(self, html_files: List[Union[str, Path]], 
+                                  output_pdf_path: Optional[Path] = None) -> str:
+        """
+        Convert HTML files to PDF using Playwright (browser-based conversion).
+        
+        Args:
+            html_files (List): List of paths to HTML files to convert.
+            output_pdf_path (Path, optional): Output PDF path.
+        
+        Returns:
+            str: Path to the generated PDF file.
+        
+        Raises:
+            FileNotFoundError: If one of the HTML files does not exist.
+            playwright.async_api.Error: If the browser fails to render the PDF (including timeouts).
+            OSError: If the PDF cannot be written.
+        """
+        # Output PDF path
+        if output_pdf_path is None:
+            output_pdf_path = self.pdf_output_folder / self.pdf_filename
+        else:
+            output_pdf_path = Path(output_pdf_path).resolve()
 
-        except ImportError:
-            print("❌ playwright is not installed. Installing...")
-            await self.install_playwright()
-            return await self.convert_html_to_pdf(html_files, output_pdf_path)
+        pdf_bytes = await self.render_pdf(html_files)
+        await asyncio.to_thread(output_pdf_path.write_bytes, pdf_bytes)
 
-        except Exception as e:
-            print(f"❌ Error converting HTML to PDF: {e}")
-            return None
+        logger.info("✅ PDF generated successfully: %s", output_pdf_path)
+        
+        # Display file size
+        logger.info("📦 File size: %.1f KB", len(pdf_bytes) / 1024)
+        
+        return str(output_pdf_path)
     
-    async def install_playwright(self):
-        """Install playwright package and browser."""
-        import subprocess
-        
-        try:
-            print("Installing playwright...")
-            subprocess.check_call([sys.executable, "-m", "pip", "install", "playwright"])
-            print("Installing chromium browser...")
-            subprocess.check_call([sys.executable, "-m", "playwright", "install", "chromium"])
-            print("✅ playwright installed successfully!")
-        except subprocess.CalledProcessError as e:
-            print(f"❌ Failed to install playwright: {e}")
-            raise
+    def _read_page(self, html_path: Path) -> str:
+        """
+        Read one generated HTML page, serving static pages from the in-memory cache.
+        
+        Args:
+            html_path (Path): Path of the generated HTML file.
+        
+        Returns:
+            str: The page's HTML.
+        """
+        if self.templates_folder is not None and html_path.name in STATIC_PAGES:
+            source = self.templates_folder / html_path.name
+            stat = source.stat()
+            return _read_static_page(str(source), stat.st_mtime_ns, stat.st_size)
+        return html_path.read_text(encoding="utf-8")
+    
+    async def _render_pdf(self, page, combined_html: str) -> bytes:
+        """
+        Render combined HTML into one PDF on the given page.
+        
+        Args:
+            page: Playwright Page; its current content is replaced.
+            combined_html (str): HTML of all pages, joined with page breaks.
+        
+        Returns:
+            bytes: The PDF document.
+        """
+        await page.set_content(combined_html, wait_until="load")
+        # Remote logos/product images and web fonts may still be in flight after "load"
+        await page.wait_for_function(
+            "Array.from(document.images).every(i => i.complete) && document.fonts.status === 'loaded'"
+        )
+        # Every template declares "@page { size: A4; margin: ... }", so page size and
+        # margins come from the CSS alone
+        return await page.pdf(
+            print_background=True,
+            prefer_css_page_size=True
+        )
     
     def cleanup_html_files(self, files_to_delete: List[str] = None):
         """
@@ -183,24 +366,20 @@ class PDFConverter:
         """
         if files_to_delete is None:
             # Only delete generated files, not permanent endingpage.html
-            files_to_delete = ["coverpage.html", "page1.html", "page2.html", "page3.html"]
+            file_paths = [self.html_input_folder / "coverpage.html", *self.html_input_folder.glob("page*.html")]
+        else:
+            file_paths = [self.html_input_folder / filename for filename in files_to_delete]
         
-        print(f"\n🗑️ Cleaning up generated HTML files...")
-        print(f"💡 Note: endingpage.html is permanent and will be preserved")
-        for filename in files_to_delete:
-            file_path = self.html_input_folder / filename
-            if file_path.exists():
-                try:
-                    file_path.unlink()
-                    print(f"✓ Deleted {filename}")
-                except Exception as e:
-                    print(f"✗ Failed to delete {filename}: {e}")
-            else:
-                print(f"⚠ {filename} not found, skipping...")
-        print(f"✅ Cleanup completed!")
+        logger.info("🗑️ Cleaning up generated HTML files (endingpage.html is permanent and will be preserved)...")
+        for file_path in file_paths:
+            try:
+                file_path.unlink(missing_ok=True)
+            except OSError as e:
+                logger.error("✗ Failed to delete %s: %s", file_path.name, e)
+        logger.info("✅ Cleanup completed!")
     
     async def run(self, html_files: List[Union[str, Path]] = None, 
-                  cleanup: bool = True) -> Optional[str]:
+                  cleanup: bool = True, data: Optional[Mapping[str, Any]] = None) -> Optional[str]:
         """
         Execute the complete PDF conversion workflow.
         
@@ -208,15 +387,17 @@ class PDFConverter:
             html_files (List): List of HTML file paths to convert. 
                               If None, uses default files from htmlGenerated folder.
             cleanup (bool): Whether to delete HTML files after conversion.
+            data (Mapping, optional): Already-parsed offer data, to skip re-reading the data file.
         
         Returns:
-            str: Path to generated PDF file, or None if conversion failed.
+            str: Path to generated PDF file, or None if HTML files are missing.
+        
+        Raises:
+            playwright.async_api.Error: If the browser fails to render the PDF.
         """
-        print("=" * 60)
-        print("PDF CONVERSION WORKFLOW STARTED")
-        print("=" * 60)
+        logger.info("PDF CONVERSION WORKFLOW STARTED")
         
-        self.load_data()
+        self.load_data(data)
         self.create_output_directory()
         
         # Default HTML files if none provided
@@ -232,52 +413,23 @@ class PDFConverter:
         # Check for missing files
         missing = [str(f) for f in html_files if not Path(f).exists()]
         if missing:
-            print(f"❌ HTML file(s) not found: {', '.join(missing)}")
+            logger.error("❌ HTML file(s) not found: %s", ', '.join(missing))
             return None
         
         # Convert to PDF
         pdf_path = await self.convert_html_to_pdf(html_files)
         
         if pdf_path and cleanup:
-            self.cleanup_html_files()
+            await asyncio.to_thread(self.cleanup_html_files)
         
-        print("=" * 60)
-        print("PDF CONVERSION COMPLETED")
-        print("=" * 60)
+        logger.info("PDF CONVERSION COMPLETED")
         
         if pdf_path:
-            print(f"\n🎉 Success! Your offer has been converted to PDF:")
-            print(f"📄 PDF file: {pdf_path}")
-            print(f"📏 Format: A4 size with 20mm margins")
-            print(f"🎨 Background colors and styling preserved")
+            logger.info("🎉 Success! Your offer has been converted to PDF: %s", pdf_path)
         
         return pdf_path
 
 
-# Legacy function for backward compatibility
-async def convert_with_playwright(html_file_path, output_pdf_path=None):
-    """
-    Legacy function - Convert HTML to PDF using Playwright.
-    Maintained for backward compatibility.
-    """
-    converter = PDFConverter()
-    
-    if isinstance(html_file_path, (list, tuple)):
-        html_files = html_file_path
-    else:
-        html_files = [html_file_path]
-    
-    return await converter.convert_html_to_pdf(html_files, output_pdf_path)
-
-async def install_playwright():
-    """
-    Legacy function - Install playwright package and browser.
-    Maintained for backward compatibility.
-    """
-    converter = PDFConverter()
-    await converter.install_playwright()
-
-
 def main():
     """Main function for standalone execution."""
     async def run():
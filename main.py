@@ -6,12 +6,14 @@ WorkflowOrchestrator. It includes comprehensive Pydantic models for data validat
 and proper error handling following FastAPI best practices.
 """
 
-import json
 import logging
+import re
+from contextlib import asynccontextmanager
 from datetime import date as Date
-from pathlib import Path
-from typing import List, Optional
-import uuid
+from typing import Annotated, List, Optional
+import shutil
+import tempfile
+from urllib.parse import quote
 import asyncio
 import sys
 
@@ -19,97 +21,195 @@ import sys
 if sys.platform == 'win32':
     asyncio.set_event_loop_policy(asyncio.WindowsProactorEventLoopPolicy())
 
-from fastapi import FastAPI, HTTPException, status
-from fastapi.responses import JSONResponse
-from pydantic import BaseModel, Field, HttpUrl, ValidationError, ConfigDict
+# uvloop is a faster drop-in event loop; it has no Windows build
+try:
+    import uvloop  # noqa: F401
+    UVLOOP_AVAILABLE = sys.platform != 'win32'
+except ImportError:
+    UVLOOP_AVAILABLE = False
 
-from workflow import WorkflowOrchestrator
+from fastapi import BackgroundTasks, Body, FastAPI, HTTPException, status
+from fastapi.responses import JSONResponse, Response
+from pydantic import AfterValidator, BaseModel, Field, ValidationError, ConfigDict, StringConstraints
+
+from htmlToPdf import BrowserPool, pdf_filename
+from workflow import WorkflowOrchestrator, create_supabase_uploader
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Launch the Chromium pool and create the Supabase uploader shared by all PDF
+    requests, then close the pool and stop Playwright on shutdown.
+    """
+    app.state.browser_pool = BrowserPool(recycle_every=50, max_contexts=8)
+    await app.state.browser_pool.start()
+    logger.info("✓ Shared Chromium browser launched")
+    app.state.supabase_uploader = create_supabase_uploader()
+    try:
+        yield
+    finally:
+        await app.state.browser_pool.close()
+        logger.info("✓ Shared Chromium browser closed")
+
+
 # Initialize FastAPI app
 app = FastAPI(
     title="PDF Generation API",
     description="API for generating PDFs from structured JSON data",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    lifespan=lifespan
 )
 
 
+# Upper bound on offers accepted by /generate-pdfs in one request
+MAX_BATCH_SIZE = 20
+
+
+# Compiled once and shared by the model validators below
+_EMAIL_RE = re.compile(r'^[^@]+@[^@]+\.[^@]+$')
+_HTTP_URL_RE = re.compile(r'^https?://[^\s/?#]+', re.IGNORECASE)
+
+
+def _validate_email(value: str) -> str:
+    if not _EMAIL_RE.match(value):
+        raise ValueError("value is not a valid email address")
+    return value
+
+
+def _validate_http_url(value: str) -> str:
+    # Cheap scheme/host check instead of a full HttpUrl parse; URLs are passed to the templates as-is
+    if not _HTTP_URL_RE.match(value):
+        raise ValueError("URL must start with http:// or https:// followed by a host")
+    return value
+
+
+# Field types shared across the models, so each constraint is defined (and built) once
+NonEmptyStr = Annotated[str, StringConstraints(min_length=1)]
+EmailAddress = Annotated[str, AfterValidator(_validate_email)]
+ImageUrl = Annotated[str, AfterValidator(_validate_http_url)]
+
+
 # Pydantic Models for Data Validation
 class SellerInfo(BaseModel):
     """Seller information model."""
-    company: str = Field(..., min_length=1, description="Company name")
-    address: str = Field(..., min_length=1, description="Company address")
-    nip: str = Field(..., min_length=1, description="Tax identification number")
-    email: str = Field(..., pattern=r'^[^@]+@[^@]+\.[^@]+$', description="Email address")
-    phone: str = Field(..., min_length=1, description="Phone number")
-    website: str = Field(..., min_length=1, description="Website URL")
-    iban: str = Field(..., min_length=1, description="IBAN number")
+    company: NonEmptyStr = Field(..., description="Company name")
+    address: NonEmptyStr = Field(..., description="Company address")
+    nip: NonEmptyStr = Field(..., description="Tax identification number")
+    email: EmailAddress = Field(..., description="Email address")
+    phone: NonEmptyStr = Field(..., description="Phone number")
+    website: NonEmptyStr = Field(..., description="Website URL")
+    iban: NonEmptyStr = Field(..., description="IBAN number")
+
+    model_config = ConfigDict(frozen=True)
 
 
 class ClientInfo(BaseModel):
     """Client information model."""
-    company: str = Field(..., min_length=1, description="Client company name")
-    email: str = Field(..., pattern=r'^[^@]+@[^@]+\.[^@]+$', description="Client email address")
-    phone: str = Field(..., min_length=1, description="Client phone number")
-    address: str = Field(..., min_length=1, description="Client address")
+    company: NonEmptyStr = Field(..., description="Client company name")
+    email: EmailAddress = Field(..., description="Client email address")
+    phone: NonEmptyStr = Field(..., description="Client phone number")
+    address: NonEmptyStr = Field(..., description="Client address")
+
+    model_config = ConfigDict(frozen=True)
 
 
 class Item(BaseModel):
     """Individual item model."""
     id: int = Field(..., gt=0, description="Item ID")
-    name: str = Field(..., min_length=1, description="Item name")
+    name: NonEmptyStr = Field(..., description="Item name")
     quantity: int = Field(..., gt=0, description="Item quantity")
     unit_price: float = Field(..., gt=0, description="Unit price")
     discount: float = Field(..., ge=0, description="Discount percentage")
     vat: float = Field(..., ge=0, le=100, description="VAT percentage")
     total: float = Field(..., gt=0, description="Total price for this item")
 
+    model_config = ConfigDict(frozen=True)
+
 
 class Summary(BaseModel):
     """Summary information model."""
     vat: float = Field(..., ge=0, description="Total VAT amount")
     total: float = Field(..., gt=0, description="Total amount")
 
+    model_config = ConfigDict(frozen=True)
+
 
 class Images(BaseModel):
     """Images URLs model."""
-    clientLogo: HttpUrl = Field(..., description="Client logo URL")
-    front: HttpUrl = Field(..., description="Front view image URL")
-    lid: HttpUrl = Field(..., description="Lid view image URL")
-    three_quarter: HttpUrl = Field(..., description="Three quarter view image URL")
-    brand: HttpUrl = Field(..., description="Brand image URL")
-    giftset: HttpUrl = Field(..., description="Gift set image URL")
+    clientLogo: ImageUrl = Field(..., description="Client logo URL")
+    front: ImageUrl = Field(..., description="Front view image URL")
+    lid: ImageUrl = Field(..., description="Lid view image URL")
+    three_quarter: ImageUrl = Field(..., description="Three quarter view image URL")
+    brand: ImageUrl = Field(..., description="Brand image URL")
+    giftset: ImageUrl = Field(..., description="Gift set image URL")
+
+    model_config = ConfigDict(frozen=True)
 
 
 class OfferData(BaseModel):
     """Main offer data model for PDF generation."""
-    offer_id: str = Field(..., min_length=1, description="Unique offer identifier")
+    offer_id: NonEmptyStr = Field(..., description="Unique offer identifier")
     date: Date = Field(..., description="Offer date")
     version: str = Field(default="v1.0", description="Version of the offer (e.g., v1.0, v2.0)")
     OfferLanguage: str = Field(default="English", description="Language for the offer (English or Polish)")
     seller: SellerInfo = Field(..., description="Seller information")
     client: ClientInfo = Field(..., description="Client information")
-    items: List[Item] = Field(..., min_items=1, description="List of items in the offer")
+    items: List[Item] = Field(..., min_length=1, description="List of items in the offer")
     summary: Summary = Field(..., description="Offer summary")
     images: Images = Field(..., description="Image URLs")
 
-    model_config = ConfigDict(
-        json_encoders={
-            Date: lambda v: v.isoformat()
-        }
-    )
+    model_config = ConfigDict(frozen=True)
+
+
+def _validate_unique_offers(offers: List[OfferData]) -> List[OfferData]:
+    # Offers sharing a PDF name would write the same local file and Supabase object concurrently
+    seen, duplicates = set(), []
+    for offer in offers:
+        name = pdf_filename(offer.client.company, offer.offer_id, offer.version)
+        if name in seen:
+            duplicates.append(name)
+        seen.add(name)
+    if duplicates:
+        raise ValueError(f"offers produce the same PDF more than once: {', '.join(duplicates)}")
+    return offers
+
+
+# Request body of /generate-pdfs; each offer must produce a distinct PDF
+OfferBatch = Annotated[List[OfferData], AfterValidator(_validate_unique_offers)]
 
 
 class PDFGenerationResponse(BaseModel):
     """Response model for PDF generation endpoint."""
     status: str = Field(..., description="Operation status")
     message: str = Field(..., description="Status message")
-    pdf_path: Optional[str] = Field(None, description="Path to generated PDF file")
+    pdf_path: Optional[str] = Field(None, description="Supabase public URL of the PDF, or its local path when not uploaded")
+
+
+class BatchPDFGenerationResponse(BaseModel):
+    """Response model for the bulk PDF generation endpoint."""
+    status: str = Field(..., description="'success' if every PDF was generated, otherwise 'partial'")
+    message: str = Field(..., description="Status message")
+    results: List[PDFGenerationResponse] = Field(..., description="Per-offer results, in request order")
+
+
+class APIInfoResponse(BaseModel):
+    """Response model for the root endpoint."""
+    message: str = Field(..., description="Service name")
+    version: str = Field(..., description="API version")
+    docs: str = Field(..., description="Swagger UI path")
+    redoc: str = Field(..., description="ReDoc path")
+
+
+class HealthResponse(BaseModel):
+    """Response model for the health check endpoint."""
+    status: str = Field(..., description="Service health status")
+    service: str = Field(..., description="Service identifier")
 
 
 class ErrorResponse(BaseModel):
@@ -119,22 +219,78 @@ class ErrorResponse(BaseModel):
     details: Optional[str] = Field(None, description="Additional error details")
 
 
+async def _remove_html_folder(path: str):
+    """Delete a request's intermediate HTML folder without blocking the event loop."""
+    await asyncio.to_thread(shutil.rmtree, path, ignore_errors=True)
+
+
+@asynccontextmanager
+async def _html_workspace(background_tasks: BackgroundTasks):
+    """
+    Give a request its own HTML output folder so concurrent requests don't clobber each other.
+    
+    On success the folder is removed by a background task after the response has been
+    sent; if the request fails it is removed right away (background tasks only run for
+    a successful response).
+    """
+    path = await asyncio.to_thread(tempfile.mkdtemp, prefix="htmlGenerated_")
+    try:
+        yield path
+    except BaseException:
+        await _remove_html_folder(path)
+        raise
+    background_tasks.add_task(_remove_html_folder, path)
+
+
+async def _run_offer(offer_data: OfferData, background_tasks: BackgroundTasks) -> str:
+    """
+    Run the PDF generation workflow for one offer in its own HTML folder.
+    
+    Args:
+        offer_data: Validated offer data
+        background_tasks: Used to defer removal of the intermediate HTML files
+        
+    Returns:
+        str: Supabase public URL of the PDF, or its local path when not uploaded
+        
+    Raises:
+        HTTPException: 500 if the workflow fails
+    """
+    async with _html_workspace(background_tasks) as html_output_folder:
+        orchestrator = WorkflowOrchestrator(
+            html_output_folder=html_output_folder,
+            cleanup_html=False,
+            browser_pool=app.state.browser_pool,
+            supabase_uploader=app.state.supabase_uploader
+        )
+        pdf_path = await orchestrator.run_with_data(offer_data.model_dump(mode="json"))
+        
+        # Validate PDF was generated successfully
+        if pdf_path is None:
+            logger.error("Workflow returned None - PDF generation failed for offer ID: %s", offer_data.offer_id)
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="PDF generation workflow failed"
+            )
+        return pdf_path
+
+
 # API Endpoints
-@app.get("/", response_model=dict)
-async def root():
+# Static payloads, built once; typed responses are serialized straight to JSON bytes by Pydantic
+_API_INFO = APIInfoResponse(message="PDF Generation API", version="1.0.0", docs="/docs", redoc="/redoc")
+_HEALTH = HealthResponse(status="healthy", service="pdf-generation-api")
+
+
+@app.get("/", response_model=APIInfoResponse)
+async def root() -> APIInfoResponse:
     """Root endpoint providing API information."""
-    return {
-        "message": "PDF Generation API",
-        "version": "1.0.0",
-        "docs": "/docs",
-        "redoc": "/redoc"
-    }
+    return _API_INFO
 
 
-@app.get("/health", response_model=dict)
-async def health_check():
+@app.get("/health", response_model=HealthResponse)
+async def health_check() -> HealthResponse:
     """Health check endpoint."""
-    return {"status": "healthy", "service": "pdf-generation-api"}
+    return _HEALTH
 
 
 @app.post(
@@ -152,16 +308,17 @@ async def health_check():
         }
     }
 )
-async def generate_pdf(offer_data: OfferData) -> PDFGenerationResponse:
+async def generate_pdf(offer_data: OfferData, background_tasks: BackgroundTasks) -> PDFGenerationResponse:
     """
     Generate PDF from offer data.
     
     This endpoint accepts structured offer data, validates it using Pydantic models,
-    saves it to a temporary JSON file, triggers the PDF generation workflow, and
-    cleans up the temporary file after completion.
+    and hands it to the PDF generation workflow in memory. The intermediate HTML
+    folder is removed in the background once the response has been sent.
     
     Args:
         offer_data: Validated offer data containing all necessary information
+        background_tasks: Used to defer removal of the intermediate HTML files
         
     Returns:
         PDFGenerationResponse: Status and path to generated PDF
@@ -169,46 +326,17 @@ async def generate_pdf(offer_data: OfferData) -> PDFGenerationResponse:
     Raises:
         HTTPException: 422 for validation errors, 500 for processing errors
     """
-    data_file_path = None
     try:
-        logger.info(f"Received PDF generation request for offer ID: {offer_data.offer_id}")
-        
-        # Save the validated data to temporary JSON file
-        data_file_path = Path(f"data_{offer_data.offer_id}_{uuid.uuid4().hex[:8]}.json")
-        with open(data_file_path, "w", encoding="utf-8") as f:
-            json.dump(offer_data.model_dump(mode="json"), f, indent=2, ensure_ascii=False)
-        logger.info(f"Successfully saved offer data to temporary file: {data_file_path}")
+        logger.info("Received PDF generation request for offer ID: %s", offer_data.offer_id)
         
         # Simply call the workflow - it handles everything
         logger.info("Starting PDF generation workflow...")
-        orchestrator = WorkflowOrchestrator()
         pdf_path = await asyncio.wait_for(
-            orchestrator.run_with_custom_data(str(data_file_path)),
+            _run_offer(offer_data, background_tasks),
             timeout=300  # 5 minutes
         )
         
-        # Validate PDF was generated successfully
-        if pdf_path is None:
-            logger.error("Workflow returned None - PDF generation failed")
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="PDF generation workflow failed"
-            )
-        
-        # Validate PDF file exists
-        if not Path(pdf_path).exists():
-            logger.error(f"PDF file not found at path: {pdf_path}")
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"PDF file not created at expected path: {pdf_path}"
-            )
-        
-        logger.info(f"PDF generated successfully at: {pdf_path}")
-        
-        # Clean up temporary JSON file after successful PDF generation
-        if data_file_path and data_file_path.exists():
-            data_file_path.unlink()
-            logger.info(f"✓ Cleaned up temporary file: {data_file_path}")
+        logger.info("PDF generated successfully at: %s", pdf_path)
         
         return PDFGenerationResponse(
             status="success",
@@ -218,39 +346,179 @@ async def generate_pdf(offer_data: OfferData) -> PDFGenerationResponse:
             
     except asyncio.TimeoutError:
         logger.error("PDF generation timed out after 5 minutes")
-        # Clean up temporary file on timeout
-        if data_file_path and data_file_path.exists():
-            data_file_path.unlink()
-            logger.info(f"✓ Cleaned up temporary file after timeout: {data_file_path}")
         raise HTTPException(
             status_code=status.HTTP_504_GATEWAY_TIMEOUT,
             detail="PDF generation timed out - process took longer than 5 minutes"
         )
     except HTTPException:
-        # Clean up temporary file on HTTP exception
-        if data_file_path and data_file_path.exists():
-            data_file_path.unlink()
-            logger.info(f"✓ Cleaned up temporary file after error: {data_file_path}")
         # Re-raise HTTP exceptions as-is
         raise
     except Exception as e:
         # Catch any unexpected errors
-        logger.error(f"Unexpected error in generate_pdf: {e}", exc_info=True)
-        # Clean up temporary file on unexpected error
-        if data_file_path and data_file_path.exists():
-            data_file_path.unlink()
-            logger.info(f"✓ Cleaned up temporary file after unexpected error: {data_file_path}")
+        logger.error("Unexpected error in generate_pdf: %s", e, exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Internal server error: {str(e)}"
         )
 
 
+@app.post(
+    "/generate-pdfs",
+    response_model=BatchPDFGenerationResponse,
+    status_code=status.HTTP_201_CREATED,
+    responses={
+        422: {
+            "model": ErrorResponse,
+            "description": "Validation Error - Invalid JSON structure"
+        },
+        500: {
+            "model": ErrorResponse,
+            "description": "Internal Server Error - PDF generation failed for every offer"
+        }
+    }
+)
+async def generate_pdfs(
+    offers: Annotated[OfferBatch, Body(min_length=1, max_length=MAX_BATCH_SIZE)],
+    background_tasks: BackgroundTasks
+) -> BatchPDFGenerationResponse:
+    """
+    Generate one PDF per offer from a list of offer data.
+    
+    The offers are rendered concurrently on the shared browser pool, which caps how
+    many conversions run at once. A failed offer does not fail the whole batch.
+    
+    Args:
+        offers: List of validated offer data (1 to MAX_BATCH_SIZE items)
+        background_tasks: Used to defer removal of the intermediate HTML files
+        
+    Returns:
+        BatchPDFGenerationResponse: Per-offer status and PDF path, in request order
+        
+    Raises:
+        HTTPException: 500 if every offer failed, 504 on timeout
+    """
+    logger.info("Received batch PDF generation request for %d offer(s)", len(offers))
+    # Offers that finish register their folder cleanup here rather than on the response:
+    # background tasks never run for an error response, so on timeout it is run right away
+    batch_cleanup = BackgroundTasks()
+    try:
+        outcomes = await asyncio.wait_for(
+            asyncio.gather(
+                *(_run_offer(offer_data, batch_cleanup) for offer_data in offers),
+                return_exceptions=True
+            ),
+            timeout=300  # 5 minutes
+        )
+    except asyncio.TimeoutError:
+        logger.error("Batch PDF generation timed out after 5 minutes")
+        await batch_cleanup()
+        raise HTTPException(
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            detail="PDF generation timed out - process took longer than 5 minutes"
+        )
+    background_tasks.add_task(batch_cleanup)
+    
+    results = []
+    for offer_data, outcome in zip(offers, outcomes):
+        if isinstance(outcome, HTTPException):
+            results.append(PDFGenerationResponse(status="error", message=outcome.detail))
+        elif isinstance(outcome, Exception):
+            logger.error("Unexpected error for offer ID %s: %s", offer_data.offer_id, outcome, exc_info=outcome)
+            results.append(PDFGenerationResponse(status="error", message=f"Internal server error: {outcome}"))
+        else:
+            results.append(PDFGenerationResponse(status="success", message="PDF generated successfully", pdf_path=outcome))
+    
+    succeeded = sum(result.status == "success" for result in results)
+    if not succeeded:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="PDF generation workflow failed for every offer in the batch"
+        )
+    
+    logger.info("Batch PDF generation finished: %d of %d succeeded", succeeded, len(results))
+    return BatchPDFGenerationResponse(
+        status="success" if succeeded == len(results) else "partial",
+        message=f"Generated {succeeded} of {len(results)} PDF(s)",
+        results=results
+    )
+
+
+@app.post(
+    "/generate-pdf/stream",
+    response_class=Response,
+    responses={
+        200: {
+            "content": {"application/pdf": {}},
+            "description": "The generated PDF document"
+        },
+        422: {
+            "model": ErrorResponse,
+            "description": "Validation Error - Invalid JSON structure"
+        },
+        500: {
+            "model": ErrorResponse,
+            "description": "Internal Server Error - PDF generation failed"
+        }
+    }
+)
+async def generate_pdf_stream(offer_data: OfferData, background_tasks: BackgroundTasks) -> Response:
+    """
+    Generate PDF from offer data and return the document in the response body.
+    
+    Unlike /generate-pdf, the PDF is rendered in memory: it is neither written to the
+    finalPdf folder nor uploaded to Supabase Storage.
+    
+    Args:
+        offer_data: Validated offer data containing all necessary information
+        background_tasks: Used to defer removal of the intermediate HTML files
+        
+    Returns:
+        Response: The PDF document (application/pdf)
+        
+    Raises:
+        HTTPException: 500 for processing errors, 504 on timeout
+    """
+    try:
+        logger.info("Received PDF stream request for offer ID: %s", offer_data.offer_id)
+        
+        async with _html_workspace(background_tasks) as html_output_folder:
+            orchestrator = WorkflowOrchestrator(
+                html_output_folder=html_output_folder,
+                cleanup_html=False,
+                upload_to_supabase=False,
+                browser_pool=app.state.browser_pool
+            )
+            pdf_bytes = await asyncio.wait_for(
+                orchestrator.run_to_bytes(offer_data.model_dump(mode="json")),
+                timeout=300  # 5 minutes
+            )
+            
+            if pdf_bytes is None:
+                logger.error("Workflow returned None - PDF generation failed")
+                raise HTTPException(
+                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                    detail="PDF generation workflow failed"
+                )
+    except asyncio.TimeoutError:
+        logger.error("PDF generation timed out after 5 minutes")
+        raise HTTPException(
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            detail="PDF generation timed out - process took longer than 5 minutes"
+        )
+    
+    filename = orchestrator.pdf_converter.pdf_filename
+    return Response(
+        content=pdf_bytes,
+        media_type="application/pdf",
+        headers={"Content-Disposition": f"attachment; filename*=UTF-8''{quote(filename)}"}
+    )
+
+
 # Global exception handlers
 @app.exception_handler(ValidationError)
 async def validation_exception_handler(request, exc: ValidationError):
     """Handle Pydantic validation errors."""
-    logger.warning(f"Validation error: {exc}")
+    logger.warning("Validation error: %s", exc)
     return JSONResponse(
         status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
         content={
@@ -264,7 +532,7 @@ async def validation_exception_handler(request, exc: ValidationError):
 @app.exception_handler(Exception)
 async def general_exception_handler(request, exc: Exception):
     """Handle general exceptions."""
-    logger.error(f"Unhandled exception: {exc}")
+    logger.error("Unhandled exception: %s", exc)
     return JSONResponse(
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
         content={
@@ -283,5 +551,6 @@ if __name__ == "__main__":
         port=8000,
         reload=False,  # Disable reload on Windows for Playwright compatibility
         log_level="info",
-        loop="asyncio"  # Force asyncio loop (uses ProactorEventLoop on Windows)
+        # uvloop on Linux/macOS; plain asyncio elsewhere (uses ProactorEventLoop on Windows)
+        loop="uvloop" if UVLOOP_AVAILABLE else "asyncio"
     )
\ No newline at end of file
@@ -3,22 +3,47 @@ Supabase Storage Uploader Module
 
 This module handles uploading PDF files from the finalPdf folder to Supabase Storage.
 It provides functionality to upload files to the 'offers' bucket and return the public URL.
+The storage methods are coroutines: file reads and HTTP calls run in worker threads so
+they never block the event loop of the API serving concurrent requests.
 """
 
 import os
+import asyncio
 import logging
 from pathlib import Path
 from typing import Optional, Dict, Any
+import httpx
 from supabase import create_client, Client
 from dotenv import load_dotenv
 
-# Load environment variables from .env file
-load_dotenv()
+# Load environment variables from .env file, skipping the parse when they are already exported
+if "SUPABASE_URL" not in os.environ or "SUPABASE_KEY" not in os.environ:
+    load_dotenv()
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Sent with every PDF upload
+_PDF_FILE_OPTIONS = {
+    "content-type": "application/pdf",
+    "upsert": "true"  # Overwrite if file exists
+}
+
+# Attempts per upload; network errors and 5xx responses are retried with a short backoff
+_UPLOAD_ATTEMPTS = 3
+
+
+def _is_retryable(error: Exception) -> bool:
+    """Whether an upload error is transient (network error or 5xx) rather than a rejected request."""
+    if isinstance(error, (httpx.TransportError, httpx.TimeoutException)):
+        return True
+    # storage3's StorageApiError carries the HTTP status (int or str); anything else is not retried
+    try:
+        return int(getattr(error, "status", None)) >= 500
+    except (TypeError, ValueError):
+        return False
+
 
 class SupabaseUploader:
     """
@@ -59,10 +84,10 @@ class SupabaseUploader:
             self.client: Client = create_client(self.supabase_url, self.supabase_key)
             logger.info("✓ Supabase client initialized successfully")
         except Exception as e:
-            logger.error(f"❌ Failed to initialize Supabase client: {e}")
+            logger.error("❌ Failed to initialize Supabase client: %s", e)
             raise
     
-    def upload_pdf(self, file_path: str, destination_path: str = None) -> Dict[str, Any]:
+    async def upload_pdf(self, file_path: str, destination_path: str = None) -> Dict[str, Any]:
         """
         Upload a PDF file to Supabase Storage.
         
@@ -86,13 +111,13 @@ class SupabaseUploader:
         # Validate file exists
         if not file_path.exists():
             error_msg = f"File not found: {file_path}"
-            logger.error(f"❌ {error_msg}")
+            logger.error("❌ %s", error_msg)
             return {"success": False, "error": error_msg}
         
         # Validate file is a PDF
         if file_path.suffix.lower() != '.pdf':
             error_msg = f"File is not a PDF: {file_path}"
-            logger.error(f"❌ {error_msg}")
+            logger.error("❌ %s", error_msg)
             return {"success": False, "error": error_msg}
         
         # Determine destination path
@@ -102,48 +127,117 @@ class SupabaseUploader:
         # Ensure destination path doesn't start with /
         destination_path = destination_path.lstrip('/')
         
-        logger.info(f"📤 Uploading {file_path.name} to Supabase Storage...")
-        logger.info(f"   Bucket: {self.bucket_name}")
-        logger.info(f"   Destination: {destination_path}")
+        logger.info("📤 Uploading %s to Supabase Storage...", file_path.name)
+        logger.info("   Bucket: %s", self.bucket_name)
+        logger.info("   Destination: %s", destination_path)
         
         try:
-            # Read file content
-            with open(file_path, 'rb') as f:
-                file_content = f.read()
+            # Upload to Supabase Storage, streaming the file from disk
+            bucket = self.client.storage.from_(self.bucket_name)
+            await self._upload_with_retries(self._upload_file, bucket, file_path, destination_path)
+            
+            # Get public URL (built locally, no request)
+            public_url = bucket.get_public_url(destination_path)
+            
+            logger.info("✅ File uploaded successfully!")
+            logger.info("   Public URL: %s", public_url)
+            
+            return {
+                "success": True,
+                "url": public_url,
+                "path": destination_path,
+                "bucket": self.bucket_name,
+                "file_name": file_path.name
+            }
             
-            # Upload to Supabase Storage
-            response = self.client.storage.from_(self.bucket_name).upload(
-                path=destination_path,
-                file=file_content,
-                file_options={
-                    "content-type": "application/pdf",
-                    "upsert": "true"  # Overwrite if file exists
-                }
+        except Exception as e:
+            error_msg = f"Failed to upload file: {str(e)}"
+            logger.error("❌ %s", error_msg)
+            return {
+                "success": False,
+                "error": error_msg
+            }
+    
+    @staticmethod
+    async def _upload_with_retries(upload, *args, **kwargs):
+        """
+        Run a blocking storage upload in a worker thread, retrying transient failures.
+        
+        The backoff between attempts is awaited, so other requests keep running while
+        an upload waits; rejected requests (4xx) are raised right away.
+        
+        Args:
+            upload: The blocking upload callable.
+            *args, **kwargs: Arguments for the upload callable.
+        
+        Returns:
+            The upload callable's result.
+        """
+        for attempt in range(1, _UPLOAD_ATTEMPTS + 1):
+            try:
+                return await asyncio.to_thread(upload, *args, **kwargs)
+            except Exception as e:
+                if attempt == _UPLOAD_ATTEMPTS or not _is_retryable(e):
+                    raise
+                logger.warning("⚠ Upload attempt %d/%d failed, retrying: %s", attempt, _UPLOAD_ATTEMPTS, e)
+                await asyncio.sleep(0.5 * attempt)
+    
+    @staticmethod
+    def _upload_file(bucket, file_path: Path, destination_path: str):
+        """
+        Upload a PDF from an open file handle so the body is streamed in chunks
+        instead of being read into memory first. Runs in a worker thread.
+        """
+        with open(file_path, 'rb') as f:
+            return bucket.upload(path=destination_path, file=f, file_options=_PDF_FILE_OPTIONS)
+    
+    async def upload_bytes(self, pdf_bytes: bytes, destination_path: str) -> Dict[str, Any]:
+        """
+        Upload a PDF that is already in memory, without writing it to disk first.
+        
+        Args:
+            pdf_bytes (bytes): The PDF document.
+            destination_path (str): Destination path in the bucket.
+        
+        Returns:
+            Dict with the same keys as upload_pdf().
+        """
+        destination_path = destination_path.lstrip('/')
+        file_name = Path(destination_path).name
+        
+        logger.info("📤 Uploading %s to Supabase Storage...", file_name)
+        logger.info("   Bucket: %s", self.bucket_name)
+        logger.info("   Destination: %s", destination_path)
+        
+        try:
+            bucket = self.client.storage.from_(self.bucket_name)
+            await self._upload_with_retries(
+                bucket.upload, path=destination_path, file=pdf_bytes, file_options=_PDF_FILE_OPTIONS
             )
             
-            # Get public URL
-            public_url = self.client.storage.from_(self.bucket_name).get_public_url(destination_path)
+            # Get public URL (built locally, no request)
+            public_url = bucket.get_public_url(destination_path)
             
-            logger.info(f"✅ File uploaded successfully!")
-            logger.info(f"   Public URL: {public_url}")
+            logger.info("✅ File uploaded successfully!")
+            logger.info("   Public URL: %s", public_url)
             
             return {
                 "success": True,
                 "url": public_url,
                 "path": destination_path,
                 "bucket": self.bucket_name,
-                "file_name": file_path.name
+                "file_name": file_name
             }
             
         except Exception as e:
             error_msg = f"Failed to upload file: {str(e)}"
-            logger.error(f"❌ {error_msg}")
+            logger.error("❌ %s", error_msg)
             return {
                 "success": False,
                 "error": error_msg
             }
     
-    def upload_from_finalPdf_folder(self, pdf_filename: str, 
+    async def upload_from_finalPdf_folder(self, pdf_filename: str, 
                                      base_folder: str = None) -> Dict[str, Any]:
         """
         Upload a PDF file from the finalPdf folder to Supabase Storage.
@@ -165,9 +259,9 @@ class SupabaseUploader:
         pdf_path = final_pdf_folder / pdf_filename
         
         # Upload the PDF
-        return self.upload_pdf(str(pdf_path), destination_path=pdf_filename)
+        return await self.upload_pdf(str(pdf_path), destination_path=pdf_filename)
     
-    def list_files(self) -> Optional[list]:
+    async def list_files(self) -> Optional[list]:
         """
         List all files in the bucket.
         
@@ -175,14 +269,14 @@ class SupabaseUploader:
             List of files in the bucket, or None if failed.
         """
         try:
-            files = self.client.storage.from_(self.bucket_name).list()
-            logger.info(f"✓ Listed {len(files)} files from bucket '{self.bucket_name}'")
+            files = await asyncio.to_thread(self.client.storage.from_(self.bucket_name).list)
+            logger.info("✓ Listed %d files from bucket '%s'", len(files), self.bucket_name)
             return files
         except Exception as e:
-            logger.error(f"❌ Failed to list files: {e}")
+            logger.error("❌ Failed to list files: %s", e)
             return None
     
-    def delete_file(self, file_path: str) -> bool:
+    async def delete_file(self, file_path: str) -> bool:
         """
         Delete a file from the bucket.
         
@@ -193,16 +287,16 @@ class SupabaseUploader:
             bool: True if deletion was successful, False otherwise.
         """
         try:
-            self.client.storage.from_(self.bucket_name).remove([file_path])
-            logger.info(f"✓ Deleted file: {file_path}")
+            await asyncio.to_thread(self.client.storage.from_(self.bucket_name).remove, [file_path])
+            logger.info("✓ Deleted file: %s", file_path)
             return True
         except Exception as e:
-            logger.error(f"❌ Failed to delete file: {e}")
+            logger.error("❌ Failed to delete file: %s", e)
             return False
 
 
 # Example usage and testing
-def main():
+async def _example():
     """
     Example usage of the SupabaseUploader class.
     """
@@ -218,7 +312,7 @@ def main():
         # Replace with your actual PDF filename
         pdf_filename = "MUTTI4_0 Technologies.pdf"
         
-        result = uploader.upload_from_finalPdf_folder(pdf_filename)
+        result = await uploader.upload_from_finalPdf_folder(pdf_filename)
         
         if result["success"]:
             print("\n✅ Upload Successful!")
@@ -231,7 +325,7 @@ def main():
         
         # List all files in bucket
         print("\n📋 Listing files in bucket...")
-        files = uploader.list_files()
+        files = await uploader.list_files()
         if files:
             for file in files:
                 print(f"   - {file.get('name', 'Unknown')}")
@@ -249,6 +343,11 @@ def main():
     print("\n" + "=" * 60)
 
 
+def main():
+    """Main function for standalone execution."""
+    asyncio.run(_example())
+
+
 if __name__ == "__main__":
     main()
 
@@ -10,28 +10,51 @@ This module orchestrates the complete PDF generation workflow:
 """
 
 import asyncio
+import logging
+import os
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional, List
+from typing import Any, Dict, List, Mapping, Optional, Tuple
 import sys
 
 from htmlGenerator import HTMLGenerator
-from htmlToPdf import PDFConverter
+from htmlToPdf import PDFConverter, STATIC_PAGES
 
-# Try to import Supabase uploader (optional)
-try:
-    from supabaseUploader import SupabaseUploader
-    SUPABASE_AVAILABLE = True
-except (ImportError, ValueError) as e:
-    SUPABASE_AVAILABLE = False
-    print(f"⚠ Supabase uploader not available: {e}")
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
 
-# Try to import Error Logger (optional)
-try:
-    from errorLogger import ErrorLogger
-    ERROR_LOGGER_AVAILABLE = True
-except (ImportError, ValueError) as e:
-    ERROR_LOGGER_AVAILABLE = False
-    print(f"⚠ Error logger not available: {e}")
+
+# Supabase uploader and Error Logger are optional and pull in supabase-py, which is slow
+# to import; they are imported on first use so importing this module stays cheap and the
+# uploader is only loaded when an upload is actually requested.
+@lru_cache(maxsize=None)
+def _import_supabase_uploader():
+    """Import SupabaseUploader on first use; returns None if the module is not available."""
+    try:
+        from supabaseUploader import SupabaseUploader
+    except (ImportError, ValueError) as e:
+        logger.warning("⚠ Supabase uploader not available: %s", e)
+        return None
+    return SupabaseUploader
+
+
+@lru_cache(maxsize=None)
+def _import_error_logger():
+    """Import ErrorLogger on first use; returns None if the module is not available."""
+    try:
+        from errorLogger import ErrorLogger
+    except (ImportError, ValueError) as e:
+        logger.warning("⚠ Error logger not available: %s", e)
+        return None
+    return ErrorLogger
+
+
+@lru_cache(maxsize=None)
+def _shared_error_logger():
+    """Build the process-wide ErrorLogger once; it holds no per-run state."""
+    ErrorLogger = _import_error_logger()
+    return ErrorLogger() if ErrorLogger is not None else None
 
 
 class WorkflowOrchestrator:
@@ -42,10 +65,25 @@ class WorkflowOrchestrator:
     managing the flow from data input through HTML generation to final PDF output.
     """
     
+    # One orchestrator is created per request; slots keep instances small and attribute access direct
+    __slots__ = (
+        "base_dir", "data_file_path", "templates_folder", "html_output_folder", "pdf_output_folder",
+        "cleanup_html", "upload_to_supabase", "delete_local_after_upload", "browser_pool",
+        "bytecode_cache_dir", "data", "html_generator", "pdf_converter", "supabase_uploader",
+        "error_logger", "generated_html_files", "generated_pdf_path", "pdf_bytes", "supabase_url"
+    )
+    
+    # Templates that must be present in a manually specified templates folder
+    REQUIRED_TEMPLATES = ('coverpage.html', 'page1.html', 'page2.html', 'page3.html')
+    
+    # Missing required templates, keyed by (templates folder, folder mtime); shared by all runs
+    _missing_templates_cache: Dict[Tuple[Path, int], Tuple[str, ...]] = {}
+    
     def __init__(self, data_file_path: str = None, templates_folder: str = None,
                  html_output_folder: str = None, pdf_output_folder: str = None,
                  cleanup_html: bool = True, upload_to_supabase: bool = True,
-                 delete_local_after_upload: bool = True):
+                 delete_local_after_upload: bool = True, browser_pool=None,
+                 supabase_uploader=None, bytecode_cache_dir: str = None):
         """
         Initialize the WorkflowOrchestrator.
         
@@ -57,6 +95,12 @@ class WorkflowOrchestrator:
             cleanup_html (bool): Whether to delete HTML files after PDF generation. Defaults to True.
             upload_to_supabase (bool): Whether to upload PDF to Supabase Storage. Defaults to True.
             delete_local_after_upload (bool): Whether to delete local PDF after successful upload. Defaults to True.
+            browser_pool (BrowserPool): Started browser pool shared across workflows. If None,
+                                        the PDF converter launches its own browser per conversion.
+            supabase_uploader (SupabaseUploader): Already-configured uploader shared across workflows.
+                                                  If None, one is created when uploading is enabled.
+            bytecode_cache_dir (str): Directory for compiled Jinja2 template bytecode, reused across
+                                      restarts. If None, a per-user directory in the system temp folder is used.
         """
         self.base_dir = Path(__file__).parent
         self.data_file_path = Path(data_file_path) if data_file_path else self.base_dir / 'data.json'
@@ -66,14 +110,20 @@ class WorkflowOrchestrator:
         self.cleanup_html = cleanup_html
         self.upload_to_supabase = upload_to_supabase
         self.delete_local_after_upload = delete_local_after_upload
+        self.browser_pool = browser_pool
+        self.bytecode_cache_dir = bytecode_cache_dir
+        # Offer data handed over in memory (run_with_data); takes precedence over data_file_path
+        self.data: Optional[Mapping[str, Any]] = None
         
         # Initialize components
         self.html_generator = None
         self.pdf_converter = None
-        self.supabase_uploader = None
+        self.supabase_uploader = supabase_uploader
         self.error_logger = None
         self.generated_html_files: List[Path] = []
         self.generated_pdf_path: Optional[str] = None
+        # PDF kept in memory when it is uploaded without a local copy
+        self.pdf_bytes: Optional[bytes] = None
         self.supabase_url: Optional[str] = None
     
     def validate_input(self) -> bool:
@@ -84,76 +134,110 @@ class WorkflowOrchestrator:
         Returns:
             bool: True if validation passes, False otherwise.
         """
-        print("\n🔍 Validating input files...")
+        logger.info("🔍 Validating input files...")
         
-        if not self.data_file_path.exists():
-            print(f"❌ Error: Data file not found: {self.data_file_path}")
+        if self.data is not None:
+            logger.info("✓ Using in-memory data")
+        elif not self.data_file_path.exists():
+            logger.error("❌ Error: Data file not found: %s", self.data_file_path)
             return False
-        print(f"✓ Data file found: {self.data_file_path}")
+        else:
+            logger.info("✓ Data file found: %s", self.data_file_path)
         
         # If templates_folder is manually specified, validate it
-        if self.templates_folder and not self.templates_folder.exists():
-            print(f"❌ Error: Templates folder not found: {self.templates_folder}")
-            return False
-        elif self.templates_folder:
-            print(f"✓ Templates folder found: {self.templates_folder}")
+        if self.templates_folder:
+            try:
+                folder_mtime_ns = self.templates_folder.stat().st_mtime_ns
+            except OSError:
+                logger.error("❌ Error: Templates folder not found: %s", self.templates_folder)
+                return False
+            logger.info("✓ Templates folder found: %s", self.templates_folder)
             # Check for template files
-            required_templates = ['coverpage.html', 'page1.html', 'page2.html', 'page3.html']
-            missing_templates = []
-            for template in required_templates:
-                if not (self.templates_folder / template).exists():
-                    missing_templates.append(template)
+            missing_templates = self._find_missing_templates(folder_mtime_ns)
             
             if missing_templates:
-                print(f"⚠ Warning: Some template files are missing: {', '.join(missing_templates)}")
-                print("  Workflow will continue but may fail during HTML generation.")
+                logger.warning("⚠ Warning: Some template files are missing: %s. "
+                               "Workflow will continue but may fail during HTML generation.",
+                               ', '.join(missing_templates))
             else:
-                print(f"✓ All required template files found")
+                logger.info("✓ All required template files found")
         else:
-            print(f"✓ Templates folder will be auto-selected based on OfferLanguage in JSON data")
+            logger.info("✓ Templates folder will be auto-selected based on OfferLanguage in JSON data")
         
-        print("✅ Validation completed\n")
+        logger.info("✅ Validation completed")
         return True
     
+    def _find_missing_templates(self, folder_mtime_ns: int) -> Tuple[str, ...]:
+        """
+        List the required templates missing from the templates folder.
+        
+        Results are cached per folder and folder mtime: adding, removing or renaming a
+        file updates the folder's mtime, so a stale result is never returned.
+        
+        Args:
+            folder_mtime_ns (int): Modification time of the templates folder in nanoseconds.
+        
+        Returns:
+            Tuple[str, ...]: Names of the missing templates (empty if all are present).
+        """
+        key = (self.templates_folder, folder_mtime_ns)
+        missing_templates = self._missing_templates_cache.get(key)
+        if missing_templates is None:
+            # One directory read instead of a stat() per template
+            with os.scandir(self.templates_folder) as entries:
+                present = {entry.name for entry in entries if entry.is_file()}
+            missing_templates = tuple(
+                template for template in self.REQUIRED_TEMPLATES if template not in present
+            )
+            self._missing_templates_cache[key] = missing_templates
+        return missing_templates
+    
     def initialize_components(self):
         """Initialize HTML generator, PDF converter, and Supabase uploader components."""
-        print("🔧 Initializing workflow components...")
+        logger.info("🔧 Initializing workflow components...")
         
+        # Hand over the Path objects as-is; the components only wrap them in Path() again
         self.html_generator = HTMLGenerator(
-            data_file_path=str(self.data_file_path),
-            templates_folder=str(self.templates_folder) if self.templates_folder else None,
-            output_folder=str(self.html_output_folder)
+            data_file_path=self.data_file_path,
+            templates_folder=self.templates_folder,
+            output_folder=self.html_output_folder,
+            data=self.data,
+            bytecode_cache_dir=self.bytecode_cache_dir
         )
         
         self.pdf_converter = PDFConverter(
-            data_file_path=str(self.data_file_path),
-            html_input_folder=str(self.html_output_folder),
-            pdf_output_folder=str(self.pdf_output_folder)
+            data_file_path=self.data_file_path,
+            html_input_folder=self.html_output_folder,
+            pdf_output_folder=self.pdf_output_folder,
+            browser_pool=self.browser_pool
         )
         
         # Initialize Supabase uploader if enabled and available
-        if self.upload_to_supabase and SUPABASE_AVAILABLE:
-            try:
-                self.supabase_uploader = SupabaseUploader()
-                print("✓ Supabase uploader initialized")
-            except ValueError as e:
-                print(f"⚠ Supabase uploader not configured: {e}")
+        if self.upload_to_supabase and self.supabase_uploader is not None:
+            pass  # Reuse the uploader (and its HTTP client) passed in by the caller
+        elif self.upload_to_supabase:
+            SupabaseUploader = _import_supabase_uploader()
+            if SupabaseUploader is None:
+                logger.warning("⚠ Supabase upload requested but module not available")
                 self.upload_to_supabase = False
-        elif self.upload_to_supabase and not SUPABASE_AVAILABLE:
-            print("⚠ Supabase upload requested but module not available")
-            self.upload_to_supabase = False
+            else:
+                try:
+                    self.supabase_uploader = SupabaseUploader()
+                    logger.info("✓ Supabase uploader initialized")
+                except ValueError as e:
+                    logger.warning("⚠ Supabase uploader not configured: %s", e)
+                    self.upload_to_supabase = False
         
         # Initialize Error Logger if available
-        if ERROR_LOGGER_AVAILABLE:
-            try:
-                self.error_logger = ErrorLogger()
-                if self.error_logger.enabled:
-                    print("✓ Error logger initialized")
-            except Exception as e:
-                print(f"⚠ Error logger initialization failed: {e}")
-                self.error_logger = None
-        
-        print("✓ Components initialized\n")
+        try:
+            self.error_logger = _shared_error_logger()
+            if self.error_logger is not None and self.error_logger.enabled:
+                logger.info("✓ Error logger initialized")
+        except Exception as e:
+            logger.warning("⚠ Error logger initialization failed: %s", e)
+            self.error_logger = None
+        
+        logger.info("✓ Components initialized")
     
     def generate_html(self, template_list: List[str] = None) -> bool:
         """
@@ -167,18 +251,19 @@ class WorkflowOrchestrator:
             bool: True if HTML generation succeeds, False otherwise.
         """
         try:
-            print("📝 STEP 1: Generating HTML files from templates")
-            print("-" * 60)
+            logger.info("📝 STEP 1: Generating HTML files from templates")
             
             # If no template list provided, use default including endingpage.html
             if template_list is None:
-                template_list = ['coverpage.html', 'page1.html', 'page2.html', 'page3.html', 'endingpage.html']
+                template_list = HTMLGenerator.DEFAULT_TEMPLATES
             
-            self.generated_html_files = self.html_generator.run(template_list)
+            # Static pages are read by the converter from its template cache, so they are not rendered
+            self.generated_html_files = self.html_generator.run(template_list, static_pages=STATIC_PAGES)
+            self.pdf_converter.templates_folder = self.html_generator.templates_folder
             
             if not self.generated_html_files:
                 error_msg = "No HTML files were generated"
-                print(f"❌ {error_msg}")
+                logger.error("❌ %s", error_msg)
                 
                 # Log error to Supabase
                 if self.error_logger:
@@ -191,11 +276,11 @@ class WorkflowOrchestrator:
                     )
                 return False
             
-            print(f"✅ Generated {len(self.generated_html_files)} HTML file(s)\n")
+            logger.info("✅ Generated %d HTML file(s)", len(self.generated_html_files))
             return True
             
         except Exception as e:
-            print(f"❌ Error during HTML generation: {e}")
+            logger.error("❌ Error during HTML generation: %s", e)
             
             # Log error to Supabase
             if self.error_logger:
@@ -218,18 +303,27 @@ class WorkflowOrchestrator:
             bool: True if PDF conversion succeeds, False otherwise.
         """
         try:
-            print("📄 STEP 2: Converting HTML files to PDF")
-            print("-" * 60)
+            logger.info("📄 STEP 2: Converting HTML files to PDF")
             
-            # All HTML files including endingpage.html are now in generated_html_files
-            self.generated_pdf_path = await self.pdf_converter.run(
-                html_files=self.generated_html_files,
-                cleanup=self.cleanup_html
-            )
+            # generated_html_files lists every page in order; endingpage.html points at its template
+            # Reuse the data HTMLGenerator already parsed instead of reading the file again
+            if self._upload_from_memory():
+                # The local copy would be deleted right after the upload, so keep the PDF in memory
+                self.pdf_converter.load_data(self.html_generator.data)
+                self.pdf_bytes = await self.pdf_converter.render_pdf(self.generated_html_files)
+                self.generated_pdf_path = str(self.pdf_converter.pdf_output_folder / self.pdf_converter.pdf_filename)
+                if self.cleanup_html:
+                    await asyncio.to_thread(self.pdf_converter.cleanup_html_files)
+            else:
+                self.generated_pdf_path = await self.pdf_converter.run(
+                    html_files=self.generated_html_files,
+                    cleanup=self.cleanup_html,
+                    data=self.html_generator.data
+                )
             
             if not self.generated_pdf_path:
                 error_msg = "PDF conversion failed - no output file generated"
-                print(f"❌ {error_msg}")
+                logger.error("❌ %s", error_msg)
                 
                 # Log error to Supabase
                 if self.error_logger:
@@ -246,11 +340,11 @@ class WorkflowOrchestrator:
                     )
                 return False
             
-            print(f"✅ PDF generated successfully\n")
+            logger.info("✅ PDF generated successfully")
             return True
             
         except Exception as e:
-            print(f"❌ Error during PDF conversion: {e}")
+            logger.error("❌ Error during PDF conversion: %s", e)
             
             # Log error to Supabase
             if self.error_logger:
@@ -264,6 +358,17 @@ class WorkflowOrchestrator:
                 )
             return False
     
+    def _upload_from_memory(self) -> bool:
+        """Whether the PDF goes straight from memory to Supabase without being written locally."""
+        return self.upload_to_supabase and self.supabase_uploader is not None and self.delete_local_after_upload
+    
+    async def _save_pdf_locally(self):
+        """Write the in-memory PDF to the PDF output folder (used when its upload fails)."""
+        pdf_path = Path(self.generated_pdf_path)
+        await asyncio.to_thread(self.pdf_converter.create_output_directory)
+        await asyncio.to_thread(pdf_path.write_bytes, self.pdf_bytes)
+        logger.info("💾 PDF saved locally: %s", pdf_path)
+    
     async def upload_to_supabase_storage(self) -> bool:
         """
         Upload the generated PDF to Supabase Storage.
@@ -273,15 +378,14 @@ class WorkflowOrchestrator:
             bool: True if upload succeeds or is skipped, False if upload fails.
         """
         if not self.upload_to_supabase:
-            print("⏭  Skipping Supabase upload (disabled or not configured)")
+            logger.info("⏭  Skipping Supabase upload (disabled or not configured)")
             return True
         
         try:
-            print("\n📤 STEP 3: Uploading PDF to Supabase Storage")
-            print("-" * 60)
+            logger.info("📤 STEP 3: Uploading PDF to Supabase Storage")
             
             if not self.supabase_uploader:
-                print("⚠ Supabase uploader not initialized, skipping upload")
+                logger.warning("⚠ Supabase uploader not initialized, skipping upload")
                 return True
             
             # Get PDF filename
@@ -289,25 +393,27 @@ class WorkflowOrchestrator:
             pdf_filename = pdf_path.name
             
             # Upload to Supabase
-            result = self.supabase_uploader.upload_from_finalPdf_folder(pdf_filename)
+            if self.pdf_bytes is not None:
+                result = await self.supabase_uploader.upload_bytes(self.pdf_bytes, destination_path=pdf_filename)
+            else:
+                result = await self.supabase_uploader.upload_pdf(str(pdf_path), destination_path=pdf_filename)
             
             if result["success"]:
-                print(f"✅ PDF uploaded to Supabase successfully!")
-                print(f"   Public URL: {result['url']}")
+                logger.info("✅ PDF uploaded to Supabase successfully! Public URL: %s", result['url'])
                 self.supabase_url = result['url']
                 
-                # Delete local PDF if configured
-                if self.delete_local_after_upload:
+                # Delete local PDF if configured (a PDF uploaded from memory was never written)
+                if self.delete_local_after_upload and self.pdf_bytes is None:
                     try:
-                        pdf_path.unlink()
-                        print(f"✓ Local PDF deleted: {pdf_filename}")
+                        await asyncio.to_thread(pdf_path.unlink)
+                        logger.info("✓ Local PDF deleted: %s", pdf_filename)
                     except Exception as e:
-                        print(f"⚠ Warning: Could not delete local PDF: {e}")
+                        logger.warning("⚠ Warning: Could not delete local PDF: %s", e)
                 
                 return True
             else:
                 error_msg = result.get('error', 'Unknown error')
-                print(f"❌ Supabase upload failed: {error_msg}")
+                logger.error("❌ Supabase upload failed: %s", error_msg)
                 
                 # Log error to Supabase
                 if self.error_logger:
@@ -326,7 +432,7 @@ class WorkflowOrchestrator:
                 return False
                 
         except Exception as e:
-            print(f"❌ Error during Supabase upload: {e}")
+            logger.error("❌ Error during Supabase upload: %s", e)
             
             # Log error to Supabase
             if self.error_logger:
@@ -339,59 +445,71 @@ class WorkflowOrchestrator:
                 )
             return False
     
-    async def run(self, template_list: List[str] = None) -> Optional[str]:
+    def _prepare(self, template_list: List[str] = None) -> bool:
         """
-        Execute the complete workflow: Data -> HTML -> PDF.
+        Validate inputs, initialize components and generate the HTML files.
+        
+        These steps are blocking (filesystem checks, Jinja rendering, file writes),
+        so the async entry points run them in a worker thread to keep the event
+        loop free for other requests.
         
         Args:
             template_list (List[str]): Optional list of template names to use.
         
         Returns:
-            str: Path to generated PDF file, or None if workflow failed.
+            bool: True if the workflow can continue with PDF conversion.
         """
-        print("\n" + "=" * 60)
-        print("🚀 PDF GENERATION WORKFLOW STARTED")
-        print("=" * 60)
-        print(f"📁 Working directory: {self.base_dir}")
-        print(f"📥 Input data: {self.data_file_path.name}")
-        print(f"📤 Output PDF folder: {self.pdf_output_folder}")
-        print("=" * 60 + "\n")
-        
-        # Validate inputs
         if not self.validate_input():
-            print("❌ Workflow aborted due to validation errors")
-            return None
+            logger.error("❌ Workflow aborted due to validation errors")
+            return False
         
-        # Initialize components
         self.initialize_components()
         
-        # Step 1: Generate HTML
         if not self.generate_html(template_list):
-            print("❌ Workflow aborted: HTML generation failed")
+            logger.error("❌ Workflow aborted: HTML generation failed")
+            return False
+        
+        return True
+    
+    async def run(self, template_list: List[str] = None) -> Optional[str]:
+        """
+        Execute the complete workflow: Data -> HTML -> PDF.
+        
+        Args:
+            template_list (List[str]): Optional list of template names to use.
+        
+        Returns:
+            str: Path to generated PDF file, or None if workflow failed.
+        """
+        logger.info("🚀 PDF GENERATION WORKFLOW STARTED")
+        logger.info("📁 Working directory: %s", self.base_dir)
+        logger.info("📥 Input data: %s", 'in-memory' if self.data is not None else self.data_file_path.name)
+        logger.info("📤 Output PDF folder: %s", self.pdf_output_folder)
+        
+        # Validate inputs, initialize components and generate HTML (Step 1)
+        if not await asyncio.to_thread(self._prepare, template_list):
             return None
         
         # Step 2: Convert to PDF
         if not await self.convert_to_pdf():
-            print("❌ Workflow aborted: PDF conversion failed")
+            logger.error("❌ Workflow aborted: PDF conversion failed")
             return None
         
         # Step 3: Upload to Supabase (optional)
         if not await self.upload_to_supabase_storage():
-            print("⚠ Warning: Supabase upload failed, but PDF was generated locally")
+            if self.pdf_bytes is not None:
+                await self._save_pdf_locally()
+            logger.warning("⚠ Warning: Supabase upload failed, but PDF was generated locally")
             # Don't abort workflow if upload fails
         
         # Success summary
-        print("\n" + "=" * 60)
-        print("✅ WORKFLOW COMPLETED SUCCESSFULLY!")
-        print("=" * 60)
+        logger.info("✅ WORKFLOW COMPLETED SUCCESSFULLY!")
         if self.supabase_url:
-            print(f"☁️  Supabase URL: {self.supabase_url}")
+            logger.info("☁️  Supabase URL: %s", self.supabase_url)
             if not self.delete_local_after_upload:
-                print(f"📄 Local PDF: {self.generated_pdf_path}")
+                logger.info("📄 Local PDF: %s", self.generated_pdf_path)
         else:
-            print(f"📄 Generated PDF: {self.generated_pdf_path}")
-        print(f"🎉 Your PDF offer is ready!")
-        print("=" * 60 + "\n")
+            logger.info("📄 Generated PDF: %s", self.generated_pdf_path)
         
         # Return Supabase URL if available, otherwise local path
         return self.supabase_url if self.supabase_url else self.generated_pdf_path
@@ -408,20 +526,87 @@ class WorkflowOrchestrator:
         Returns:
             str: Path to generated PDF file, or None if workflow failed.
         """
-        print(f"🔧 DEBUG: run_with_custom_data called with: {data_file_path}")
         self.data_file_path = Path(data_file_path)
-        print(f"🔧 DEBUG: data_file_path set to: {self.data_file_path}")
-        print(f"🔧 DEBUG: data file exists: {self.data_file_path.exists()}")
+        logger.debug("🔧 run_with_custom_data: data_file_path set to %s", self.data_file_path)
         
-        # Reinitialize components with the new data file path
-        print("🔧 DEBUG: Reinitializing components...")
-        self.initialize_components()
-        print("🔧 DEBUG: Components reinitialized")
+        # run() initializes the components for the new data file path
+        return await self.run(template_list)
+
+    
+    async def run_with_data(self, data: Mapping[str, Any],
+                            template_list: List[str] = None) -> Optional[str]:
+        """
+        Run workflow with offer data that is already in memory, without a data file.
+        
+        Args:
+            data (Mapping): Offer data, shaped like the JSON data file.
+            template_list (List[str]): Optional list of template names to use.
+        
+        Returns:
+            str: Supabase URL or path to generated PDF file, or None if workflow failed.
+        """
+        self.data = data
+        return await self.run(template_list)
+    
+    async def run_to_bytes(self, data: Mapping[str, Any],
+                           template_list: List[str] = None) -> Optional[bytes]:
+        """
+        Run the workflow for in-memory offer data and return the PDF in memory.
+        
+        Nothing is written to the PDF output folder and nothing is uploaded, so the
+        caller can stream the document straight back to the client.
+        
+        Args:
+            data (Mapping): Offer data, shaped like the JSON data file.
+            template_list (List[str]): Optional list of template names to use.
+        
+        Returns:
+            bytes: The PDF document, or None if the workflow failed.
+        """
+        self.data = data
+        
+        if not await asyncio.to_thread(self._prepare, template_list):
+            return None
         
-        print("🔧 DEBUG: Starting workflow...")
-        result = await self.run(template_list)
-        print(f"🔧 DEBUG: Workflow completed. Result: {result}")
-        return result
+        logger.info("📄 STEP 2: Rendering PDF in memory")
+        try:
+            self.pdf_converter.load_data(self.html_generator.data)
+            pdf_bytes = await self.pdf_converter.render_pdf(self.generated_html_files)
+        except Exception as e:
+            logger.error("❌ Error during PDF conversion: %s", e)
+            if self.error_logger:
+                self.error_logger.log_workflow_error(
+                    step_name="run_to_bytes",
+                    error=e,
+                    additional_context={
+                        "html_files_count": len(self.generated_html_files),
+                        "html_files": [str(f) for f in self.generated_html_files]
+                    }
+                )
+            return None
+        finally:
+            if self.cleanup_html:
+                await asyncio.to_thread(self.pdf_converter.cleanup_html_files)
+        
+        logger.info("✅ PDF rendered (%.1f KB)", len(pdf_bytes) / 1024)
+        return pdf_bytes
+
+
+def create_supabase_uploader():
+    """
+    Create a Supabase uploader to share across workflows.
+    
+    Returns:
+        SupabaseUploader: Configured uploader, or None if the module or credentials are unavailable.
+    """
+    SupabaseUploader = _import_supabase_uploader()
+    if SupabaseUploader is None:
+        return None
+    try:
+        return SupabaseUploader()
+    except ValueError as e:
+        logger.warning("⚠ Supabase uploader not configured: %s", e)
+        return None
 
 
 def main():
@@ -430,7 +615,7 @@ def main():
         # Check if custom data file path is provided as command line argument
         if len(sys.argv) > 1:
             data_file = sys.argv[1]
-            print(f"Using custom data file: {data_file}")
+            logger.info("Using custom data file: %s", data_file)
             orchestrator = WorkflowOrchestrator()
             await orchestrator.run_with_custom_data(data_file)
         else: